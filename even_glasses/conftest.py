@@ -0,0 +1 @@
+# Lets `pytest` run from this directory without installing the package
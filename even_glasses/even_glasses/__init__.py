@@ -2,12 +2,16 @@ from even_glasses.bluetooth_manager import (
     Glass,
     GlassesManager
 )
+from even_glasses.fleet import GlassesFleet
 
 from even_glasses.models import (
     ScreenAction,
     Notification,
     RSVPConfig,
+    RSVPStats,
+    NotificationPriority,
     Command,  
+    ConnectionState,
 )
 
 __version__ = "0.1.07"
@@ -15,8 +19,12 @@ __version__ = "0.1.07"
 __all__ = [
     "Glass",
     "GlassesManager",
+    "GlassesFleet",
     "Command",
     "ScreenAction",
     "Notification",
     "RSVPConfig",
+    "RSVPStats",
+    "NotificationPriority",
+    "ConnectionState",
 ]
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""Per-frame encoding microbenchmark.
+
+Compares the pydantic models with the struct-based encoders used on the
+send path:
+
+    python -m even_glasses.benchmark [--number N]
+"""
+import argparse
+import timeit
+
+from even_glasses.encoders import SendResultPacket, encode_notification
+from even_glasses.models import NCSNotification, Notification, SendResult, ScreenAction, AIStatus
+
+PAGE = "\n".join(["", "The quick brown fox jumps over", "the lazy dog", "", ""]).encode("utf-8")
+MAX_PACKET_SIZE = 244
+
+
+def _send_result_pydantic():
+    return SendResult(
+        screen_status=ScreenAction.NEW_CONTENT | AIStatus.DISPLAYING,
+        page_number=1,
+        max_pages=1,
+        data=PAGE,
+    ).fragment(MAX_PACKET_SIZE)
+
+
+def _send_result_struct():
+    return SendResultPacket(PAGE, 1, 1).fragment(MAX_PACKET_SIZE)
+
+
+def _notification():
+    return NCSNotification(
+        msg_id=1,
+        app_identifier="org.telegram.messenger",
+        title="Message",
+        subtitle="John Doe",
+        message="You have a new message from John Doe. " * 4,
+        display_name="Telegram",
+    )
+
+
+def _run_sync(coro):
+    """Drive a coroutine that never suspends, without an event loop.
+
+    Keeps loop scheduling out of the timings so only the encoders compare.
+    """
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    coro.close()
+    raise RuntimeError("Coroutine suspended; it cannot be run without a loop")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="even_glasses encoder microbenchmark")
+    parser.add_argument("--number", type=int, default=20000, help="Iterations per case")
+    args = parser.parse_args()
+
+    notification = _notification()
+
+    def notification_pydantic():
+        model = Notification(ncs_notification=notification)
+        return _run_sync(model.construct_notification(MAX_PACKET_SIZE))
+
+    def notification_buffer():
+        return encode_notification(notification, MAX_PACKET_SIZE)
+
+    cases = [
+        ("SendResult frame", _send_result_pydantic, _send_result_struct),
+        ("Notification frames", notification_pydantic, notification_buffer),
+    ]
+    print(f"{'case':<22}{'pydantic us':>14}{'struct us':>12}{'speedup':>10}")
+    for name, before, after in cases:
+        before_us = timeit.timeit(before, number=args.number) / args.number * 1e6
+        after_us = timeit.timeit(after, number=args.number) / args.number * 1e6
+        print(f"{name:<22}{before_us:>14.2f}{after_us:>12.2f}{before_us / after_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
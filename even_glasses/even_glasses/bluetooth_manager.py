@@ -1,38 +1,105 @@
 import asyncio
 import logging
+import random
+import time
+from collections import defaultdict, deque
 from bleak import BleakClient, BleakScanner
 from bleak.exc import BleakError
-from typing import Optional, Callable
-
-from even_glasses.utils import construct_heartbeat
+from typing import Any, Optional, Callable, Deque, Dict, List, Set
+
+from even_glasses.capture import CaptureChannel, ProtocolCapture
+from even_glasses.device_cache import DeviceCache
+from even_glasses.dispatcher import Handler, PacketDispatcher
+from even_glasses.encoders import encode_mic_command
+from even_glasses.metrics import DeviceMetrics, MetricsRegistry
+from even_glasses.mic import MicReceiver
+from even_glasses.models import Command, ConnectionState, MicStatus
+from even_glasses.notification_queue import NotificationQueue
+from even_glasses.trace import RX, TX, tracer
+from even_glasses.utils import construct_heartbeat, is_acknowledgment
 from even_glasses.service_identifiers import (
     UART_SERVICE_UUID,
     UART_TX_CHAR_UUID,
     UART_RX_CHAR_UUID,
 )
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+StateListener = Callable[["BleDevice", ConnectionState], Any]
+
+ATT_HEADER_SIZE = 3  # Opcode and handle bytes taken from every write
+DEFAULT_MTU = 247  # Assumed when the backend cannot report the MTU
+
+
+def device_display_name(device, advertisement_data=None) -> str:
+    """Advertised name of a scan result, falling back to the local name."""
+    return device.name or getattr(advertisement_data, "local_name", None) or ""
+
 
 class BleDevice:
     """Base class for BLE device communication."""
 
-    def __init__(self, name: str, address: str):
+    def __init__(
+        self,
+        name: str,
+        address: str,
+        client_factory: Optional[Callable[..., BleakClient]] = None,
+        ble_device=None,
+        metrics_registry: Optional[MetricsRegistry] = None,
+    ):
         self.name = name
         self.address = address
-        self.client = BleakClient(
-            address,
+        self.metrics = DeviceMetrics(name, metrics_registry)
+        # Opt-in recording of every frame written and notified
+        self.capture: Optional[CaptureChannel] = None
+        # A BLEDevice from a scan lets bleak connect without scanning again
+        self.client = (client_factory or BleakClient)(
+            ble_device or address,
             disconnected_callback=self._handle_disconnection,
         )
         self.uart_tx = None
         self.uart_rx = None
+        # ATT MTU detected on connect
+        self.mtu = DEFAULT_MTU
         self._write_lock = asyncio.Lock()
+        # Streaming mode: 0 keeps every write confirmed, otherwise this many
+        # writes-without-response may be outstanding before a confirmed write
+        self.stream_window = 0
+        self._stream_credits = 0
         self.notifications_started = False
         self.notification_handler: Optional[Callable[[int, bytes], None]] = None
+        # Typed per-opcode routing of incoming packets
+        self.dispatcher = PacketDispatcher(self)
+        # Futures waiting for the next response to a command, keyed by opcode
+        self._response_waiters: Dict[int, Deque[asyncio.Future]] = defaultdict(deque)
+        # Monotonic time of the last successful write or incoming packet
+        self.last_activity = 0.0
+        # Monotonic time of the last successful write; paces heartbeats
+        self.last_write = 0.0
+        # Round-trip time of the last request/response pair and its EWMA
+        self.rtt: Optional[float] = None
+        self.rtt_avg: Optional[float] = None
+        self.rtt_smoothing = 0.2
+        # Reconnect backoff: first retry at once, then base * 2^n with jitter
+        self.reconnect_base_delay = 0.5
+        self.reconnect_max_delay = 30.0
+        self.max_reconnect_attempts: Optional[int] = 10
+        self.reconnects = 0
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._closing = False  # Set by disconnect(); suppresses reconnects
+        self.state = ConnectionState.DISCONNECTED
+        self._state_listeners: List[StateListener] = []
+        # Running coroutine listeners; referenced so they are not collected
+        self._listener_tasks: Set[asyncio.Task] = set()
+        # Packets of the latest display frame, replayed after a reconnect
+        self.replay_limit = 16
+        self._display_state: List[bytes] = []
 
     async def connect(self):
         logger.info(f"Connecting to {self.name} ({self.address})")
+        self._closing = False
+        if not self.reconnecting:
+            self._set_state(ConnectionState.CONNECTING)
         try:
             await self.client.connect()
             logger.info(f"Connected to {self.name}")
@@ -51,13 +118,35 @@ class BleDevice:
             if not self.uart_tx or not self.uart_rx:
                 raise BleakError(f"UART TX/RX characteristics not found for {self.name}")
 
+            self.mtu = await self._discover_mtu()
+            logger.info(f"MTU for {self.name}: {self.mtu}")
+
             await self.start_notifications()
         except Exception as e:
             logger.error(f"Error connecting to {self.name}: {e}")
-            await self.disconnect()
+            # A failed connect is not a dropout; don't start a reconnect
+            closing, self._closing = self._closing, True
+            await self._close_link()
+            self._closing = closing
+            if not self.reconnecting:
+                self._set_state(ConnectionState.FAILED)
             raise
+        self._set_state(ConnectionState.CONNECTED)
 
     async def disconnect(self):
+        """Close the link on purpose; no reconnect is attempted."""
+        self._closing = True
+        task = self._reconnect_task
+        if task and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self._close_link()
+        self._set_state(ConnectionState.DISCONNECTED)
+
+    async def _close_link(self):
         if self.notifications_started and self.uart_rx:
             await self.client.stop_notify(self.uart_rx)
             self.notifications_started = False
@@ -68,21 +157,97 @@ class BleDevice:
             logger.info(f"Disconnected from {self.name}")
 
     def _handle_disconnection(self, client: BleakClient):
+        self.notifications_started = False
+        if self._closing:
+            if not self.reconnecting:
+                self._set_state(ConnectionState.DISCONNECTED)
+            return
+        self.metrics.disconnects.value += 1
         logger.warning(f"Device {self.name} disconnected")
-        asyncio.create_task(self.reconnect())
-
-    async def reconnect(self):
-        retries = 3
-        for attempt in range(1, retries + 1):
+        self.start_reconnect()
+
+    def start_reconnect(self) -> asyncio.Task:
+        """Start reconnecting unless a reconnect is already in flight."""
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+            self._set_state(ConnectionState.RECONNECTING)
+        return self._reconnect_task
+
+    async def reconnect(self) -> bool:
+        return await self.start_reconnect()
+
+    @property
+    def reconnecting(self) -> bool:
+        return self._reconnect_task is not None and not self._reconnect_task.done()
+
+    def add_state_listener(self, listener: StateListener):
+        """Call `listener(device, state)` on every connection state change.
+
+        Coroutine listeners are scheduled as tasks.
+        """
+        self._state_listeners.append(listener)
+
+    def remove_state_listener(self, listener: StateListener):
+        if listener in self._state_listeners:
+            self._state_listeners.remove(listener)
+
+    def _set_state(self, state: ConnectionState):
+        if state == self.state:
+            return
+        self.state = state
+        logger.debug(f"{self.name} is {state.value}")
+        for listener in list(self._state_listeners):
+            try:
+                result = listener(self, state)
+                if asyncio.iscoroutine(result):
+                    task = asyncio.ensure_future(result)
+                    self._listener_tasks.add(task)
+                    task.add_done_callback(self._listener_done)
+            except Exception as e:
+                logger.error(f"State listener for {self.name} failed: {e}")
+
+    def _listener_done(self, task: asyncio.Task):
+        self._listener_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"State listener for {self.name} failed: {task.exception()}")
+
+    def _backoff(self, attempt: int) -> float:
+        if attempt <= 1:
+            return 0.0
+        delay = min(self.reconnect_max_delay, self.reconnect_base_delay * 2 ** (attempt - 2))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _reconnect(self) -> bool:
+        attempt = 0
+        while not self._closing:
+            attempt += 1
+            if self.max_reconnect_attempts and attempt > self.max_reconnect_attempts:
+                logger.error(f"Failed to reconnect to {self.name} after {attempt - 1} attempts")
+                self._set_state(ConnectionState.FAILED)
+                return False
+            await asyncio.sleep(self._backoff(attempt))
+            if self._closing:
+                break
             try:
-                logger.info(f"Reconnecting to {self.name} (Attempt {attempt}/{retries})")
+                logger.info(f"Reconnecting to {self.name} (Attempt {attempt})")
                 await self.connect()
-                logger.info(f"Reconnected to {self.name}")
-                return
             except Exception as e:
                 logger.error(f"Reconnection attempt {attempt} failed: {e}")
-                await asyncio.sleep(5)
-        logger.error(f"Failed to reconnect to {self.name} after {retries} attempts")
+                continue
+            self.reconnects += 1
+            self.metrics.reconnects.value += 1
+            logger.info(f"Reconnected to {self.name}")
+            await self._restore_state()
+            return True
+        return False
+
+    async def _restore_state(self):
+        """Replay the latest display frame after a reconnect."""
+        packets = self._display_state
+        # Only a complete frame is worth replaying
+        if packets and len(packets) == max(1, packets[0][2]):
+            if not await self.send_and_wait_many(list(packets)):
+                logger.warning(f"Could not restore display on {self.name}")
 
     async def start_notifications(self):
         if not self.notifications_started and self.uart_rx:
@@ -94,25 +259,193 @@ class BleDevice:
                 logger.error(f"Failed to start notifications for {self.name}: {e}")
 
     async def send(self, data: bytes) -> bool:
+        if data and data[0] == Command.SEND_RESULT:
+            self._remember_display(data)
         if not self.client.is_connected:
-            logger.warning(f"Cannot send data, {self.name} is disconnected.")
+            if not self.reconnecting:
+                logger.warning(f"Cannot send data, {self.name} is disconnected.")
             return False
 
         if not self.uart_tx:
             logger.warning(f"No TX characteristic available for {self.name}.")
             return False
 
+        metrics = self.metrics
+        queued = time.perf_counter()
+        metrics.pending_writes.value += 1
         try:
             async with self._write_lock:
-                await self.client.write_gatt_char(self.uart_tx, data, response=True)
-            logger.info(f"Data sent to {self.name}: {data.hex()}")
+                started = time.perf_counter()
+                metrics.lock_wait.observe(started - queued)
+                response = self._take_stream_credit()
+                await self.client.write_gatt_char(self.uart_tx, data, response=response)
+                metrics.write_latency.observe(time.perf_counter() - started)
+            metrics.sent(data)
+            if self.capture is not None:
+                self.capture.outbound(data)
+            self.last_activity = self.last_write = time.monotonic()
+            if tracer.active:
+                tracer.frame(TX, self.name, data)
             return True
         except Exception as e:
+            self._stream_credits = 0  # Confirm the next write to resync
+            metrics.write_errors.value += 1
             logger.error(f"Error sending data to {self.name}: {e}")
             return False
+        finally:
+            metrics.pending_writes.value -= 1
+
+    def _remember_display(self, packet: bytes):
+        # Package 0 starts a new frame, which replaces the previous one
+        if len(packet) > 3 and packet[3] == 0:
+            self._display_state = []
+        elif not self._display_state:
+            return  # Rest of a frame that was too large to keep
+        if len(self._display_state) >= self.replay_limit:
+            self._display_state = []  # Never replay a partial frame
+            return
+        self._display_state.append(bytes(packet))
+
+    async def _discover_mtu(self) -> int:
+        """Ask the backend for the negotiated ATT MTU."""
+        # BlueZ only reports the real MTU after it has been acquired explicitly
+        acquire_mtu = getattr(getattr(self.client, "_backend", None), "_acquire_mtu", None)
+        if acquire_mtu:
+            try:
+                await acquire_mtu()
+            except Exception as e:
+                logger.warning(f"Could not acquire MTU for {self.name}: {e}")
+        try:
+            return self.client.mtu_size or DEFAULT_MTU
+        except Exception:
+            return DEFAULT_MTU
+
+    @property
+    def max_write_size(self) -> int:
+        """Largest payload a single write can carry."""
+        return self.mtu - ATT_HEADER_SIZE
+
+    def enable_streaming(self, window: int = 8):
+        """Send with write-without-response, confirming every `window`-th write.
+
+        The confirmed write is a sync point: it only completes once the
+        device has taken every earlier write, which refills the window.
+        """
+        if window < 1:
+            raise ValueError("Streaming window must be at least 1")
+        self.stream_window = window
+        self._stream_credits = window
+
+    def disable_streaming(self):
+        """Go back to confirming every write."""
+        self.stream_window = 0
+        self._stream_credits = 0
+
+    def sync_stream(self):
+        """Make the next write a confirmed one, e.g. at the end of a burst."""
+        self._stream_credits = 0
+
+    def _take_stream_credit(self) -> bool:
+        """Consume a window credit; return True if this write must be confirmed."""
+        if not self.stream_window:
+            return True
+        if self._stream_credits <= 1:
+            self._stream_credits = self.stream_window
+            return True
+        self._stream_credits -= 1
+        return False
+
+    def expect_response(self, command: int) -> asyncio.Future:
+        """Return a future resolved with the next notification for `command`.
+
+        Register before writing the request so a fast reply cannot be missed.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._response_waiters[command].append(future)
+        return future
+
+    def _resolve_response(self, data: bytes):
+        waiters = self._response_waiters.get(data[0])
+        while waiters:
+            future = waiters.popleft()
+            if not future.done():
+                future.set_result(bytes(data))
+                return
+
+    async def send_and_wait(self, data: bytes, timeout: float = 1.0) -> bool:
+        """Send data and wait until the device acknowledges it.
+
+        Returns False if the write fails, the device reports a failure, or no
+        response arrives within `timeout` seconds.
+        """
+        return await self.send_and_wait_many([data], timeout=timeout)
+
+    async def send_and_wait_many(self, packets: List[bytes], timeout: float = 1.0) -> bool:
+        """Write packets back-to-back, then wait for all of their ACKs.
+
+        `timeout` bounds the wait for the ACKs after the last write.
+        """
+        responses = [self.expect_response(packet[0]) for packet in packets]
+        started = time.monotonic()
+        try:
+            for packet in packets:
+                if not await self.send(packet):
+                    for response in responses:
+                        response.cancel()
+                    return False
+        except BaseException:
+            # A waiter left behind would swallow a later reply to its opcode
+            for response in responses:
+                response.cancel()
+            raise
+        # asyncio.wait rather than wait_for: on 3.11 wait_for drops a
+        # cancellation that lands in the same tick as the last ACK
+        try:
+            _, pending = await asyncio.wait(responses, timeout=timeout) if responses else ((), ())
+        except BaseException:
+            for response in responses:
+                response.cancel()
+            raise
+        if pending:
+            for response in pending:
+                response.cancel()
+            self.metrics.ack_timeouts.value += 1
+            logger.warning(f"Timeout waiting for acknowledgment from {self.name}")
+            return False
+        if len(packets) == 1:
+            self.record_rtt(time.monotonic() - started)
+        for reply in (response.result() for response in responses):
+            if not is_acknowledgment(reply):
+                logger.warning(f"Unexpected response from {self.name}: {reply.hex()}")
+                return False
+        return True
+
+    def record_rtt(self, sample: float):
+        """Fold a request/response round-trip time into the link estimate."""
+        self.rtt = sample
+        self.metrics.ack_rtt.observe(sample)
+        if self.rtt_avg is None:
+            self.rtt_avg = sample
+        else:
+            self.rtt_avg += self.rtt_smoothing * (sample - self.rtt_avg)
+
+    def subscribe(self, command: int, handler: Handler):
+        """Receive typed events for incoming packets starting with `command`."""
+        self.dispatcher.subscribe(command, handler)
+
+    def unsubscribe(self, command: int, handler: Handler):
+        self.dispatcher.unsubscribe(command, handler)
 
     async def handle_notification(self, sender: int, data: bytes):
-        logger.info(f"Notification from {self.name}: {data.hex()}")
+        self.last_activity = time.monotonic()
+        if data:
+            self.metrics.received(data)
+            if self.capture is not None:
+                self.capture.inbound(data)
+            if tracer.active:
+                tracer.frame(RX, self.name, data)
+            self._resolve_response(data)
+            await self.dispatcher.dispatch(data)
         if self.notification_handler:
             await self.notification_handler(sender, data)
 
@@ -126,38 +459,126 @@ class Glass(BleDevice):
         address: str,
         side: str,
         heartbeat_freq: int = 5,
+        client_factory: Optional[Callable[..., BleakClient]] = None,
+        heartbeat_timeout: float = 2.0,
+        ble_device=None,
+        metrics_registry: Optional[MetricsRegistry] = None,
     ):
-        super().__init__(name, address)
+        super().__init__(
+            name,
+            address,
+            client_factory=client_factory,
+            ble_device=ble_device,
+            metrics_registry=metrics_registry,
+        )
         self.side = side
         self.heartbeat_freq = heartbeat_freq
+        self.heartbeat_timeout = heartbeat_timeout
         self.heartbeat_task: Optional[asyncio.Task] = None
+        self.heartbeat_seq = 0
+        self.heartbeats_sent = 0
+        self.heartbeats_skipped = 0
+        self.heartbeats_missed = 0
+        self.mic: Optional[MicReceiver] = None
 
     async def start_heartbeat(self):
         if self.heartbeat_task is None or self.heartbeat_task.done():
             self.heartbeat_task = asyncio.create_task(self._heartbeat())
 
     async def _heartbeat(self):
+        """Keep the link alive when nothing else does.
+
+        A heartbeat is only sent after `heartbeat_freq` seconds without a
+        write, so it never competes with display traffic. Incoming packets
+        such as mic data do not count: the arm still expects to hear from us.
+        Its echo is timed to keep the RTT estimate current.
+        """
         while self.client.is_connected:
             try:
-                heartbeat = construct_heartbeat(1)
-                await self.send(heartbeat)
-                await asyncio.sleep(self.heartbeat_freq)
+                idle = time.monotonic() - self.last_write
+                if idle < self.heartbeat_freq:
+                    await asyncio.sleep(self.heartbeat_freq - idle)
+                    if time.monotonic() - self.last_write < self.heartbeat_freq:
+                        self.heartbeats_skipped += 1
+                        continue
+                await self._send_heartbeat()
             except Exception as e:
                 logger.error(f"Heartbeat error for {self.name}: {e}")
                 break
 
+    async def _send_heartbeat(self) -> bool:
+        self.heartbeat_seq = (self.heartbeat_seq + 1) & 0xFF
+        seq = self.heartbeat_seq
+        response = self.expect_response(Command.HEARTBEAT)
+        started = time.monotonic()
+        if not await self.send(construct_heartbeat(seq)):
+            response.cancel()
+            # Count the attempt as a write so a dead link is not hammered
+            self.last_write = time.monotonic()
+            return False
+        self.heartbeats_sent += 1
+        deadline = started + self.heartbeat_timeout
+        try:
+            while True:
+                reply = await asyncio.wait_for(response, deadline - time.monotonic())
+                if len(reply) > 3 and reply[3] == seq:
+                    break
+                # Late echo of an earlier heartbeat; wait for ours
+                response = self.expect_response(Command.HEARTBEAT)
+        except asyncio.TimeoutError:
+            self.heartbeats_missed += 1
+            logger.warning(f"No heartbeat reply from {self.name} (seq {seq})")
+            return False
+        self.record_rtt(time.monotonic() - started)
+        return True
+
     async def connect(self):
         await super().connect()
         await self.start_heartbeat()
 
+    async def start_mic(self, capacity: int = 512, timeout: float = 1.0) -> Optional[MicReceiver]:
+        """Enable the microphone and return a receiver for its audio frames.
+
+        The G1 streams mic audio from the right glass only.
+        """
+        if self.mic is None:
+            self.mic = MicReceiver(capacity=capacity)
+            self.subscribe(Command.RECEIVE_MIC_DATA, self.mic.handle_event)
+        enable = encode_mic_command(MicStatus.ENABLE)
+        if not await self.send_and_wait(enable, timeout=timeout):
+            logger.error(f"Failed to enable mic on {self.name}")
+            await self.stop_mic(timeout=timeout)
+            return None
+        return self.mic
+
+    async def stop_mic(self, timeout: float = 1.0):
+        """Disable the microphone and end the receiver's stream."""
+        if self.mic is None:
+            return
+        mic, self.mic = self.mic, None
+        if self.client.is_connected:
+            disable = encode_mic_command(MicStatus.DISABLE)
+            await self.send_and_wait(disable, timeout=timeout)
+        self.unsubscribe(Command.RECEIVE_MIC_DATA, mic.handle_event)
+        mic.close()
+
+    async def _restore_state(self):
+        await super()._restore_state()
+        if self.mic is not None:
+            enable = encode_mic_command(MicStatus.ENABLE)
+            if not await self.send_and_wait(enable):
+                logger.warning(f"Could not re-enable mic on {self.name}")
+
     async def disconnect(self):
+        await self.stop_mic()
+        # Stop any reconnect first, or it could restart the heartbeat
+        await super().disconnect()
         if self.heartbeat_task and not self.heartbeat_task.done():
             self.heartbeat_task.cancel()
             try:
                 await self.heartbeat_task
             except asyncio.CancelledError:
                 pass
-        await super().disconnect()
 
 
 class GlassesManager:
@@ -169,41 +590,156 @@ class GlassesManager:
         right_address: str = None,
         left_name: str = "G1 Left Glass",
         right_name: str = "G1 Right Glass",
+        client_factory: Optional[Callable[..., BleakClient]] = None,
+        scanner=BleakScanner,
+        device_cache: Optional[DeviceCache] = None,
     ):
+        # client_factory and scanner default to bleak; pass the ones from
+        # even_glasses.simulator to run without hardware.
+        self.client_factory = client_factory
+        self.scanner = scanner
+        # Known addresses to try before (and alongside) a scan
+        self.device_cache = device_cache
+        self.stream_window = 0
+        self.capture: Optional[ProtocolCapture] = None
+        self._notifications: Optional[NotificationQueue] = None
+        self._subscriptions: List[tuple] = []
+        self._state_listeners: List[StateListener] = []
         self.left_glass: Optional[Glass] = (
-            Glass(name=left_name, address=left_address, side="left")
+            self._create_glass(left_name, left_address, "left")
             if left_address
             else None
         )
         self.right_glass: Optional[Glass] = (
-            Glass(name=right_name, address=right_address, side="right")
+            self._create_glass(right_name, right_address, "right")
             if right_address
             else None
         )
 
+    def _create_glass(self, name: str, address: str, side: str, ble_device=None) -> Glass:
+        glass = Glass(
+            name=name,
+            address=address,
+            side=side,
+            client_factory=self.client_factory,
+            ble_device=ble_device,
+        )
+        if self.stream_window:
+            glass.enable_streaming(self.stream_window)
+        for command, handler in self._subscriptions:
+            glass.subscribe(command, handler)
+        for listener in self._state_listeners:
+            glass.add_state_listener(listener)
+        if self.capture:
+            glass.capture = self.capture.channel(name)
+        return glass
+
+    def add_detected(self, device, advertisement_data=None) -> Optional[Glass]:
+        """Adopt a scanned arm if its side is still free.
+
+        Returns the new, not yet connected Glass, or None if the device is not
+        a G1 arm or that side is already taken.
+        """
+        device_name = device_display_name(device, advertisement_data)
+        if "_L_" in device_name and not self.left_glass:
+            side = "left"
+        elif "_R_" in device_name and not self.right_glass:
+            side = "right"
+        else:
+            return None
+        logger.info(f"Found device: {device_name}, Address: {device.address}")
+        glass = self._create_glass(device_name, device.address, side, ble_device=device)
+        setattr(self, f"{side}_glass", glass)
+        return glass
+
     async def scan_and_connect(self, timeout: int = 10) -> bool:
-        """Scan for glasses devices and connect to them."""
+        """Scan for glasses devices and connect to them.
+
+        Glasses known up front or from the device cache are connected right
+        away while a scan runs in the background. Each arm the scan detects
+        starts connecting at once, and scanning stops as soon as both arms
+        are found, since discovery slows connects down on some stacks. A
+        cached arm only counts as found once it has connected: if it fails,
+        its entry is invalidated and the scan looks for the arm instead. The
+        wait ends early if a connect fails, and otherwise after `timeout`
+        seconds.
+        """
         try:
-            logger.info("Scanning for glasses devices...")
-            devices = await BleakScanner.discover(timeout=timeout)
-            for device in devices:
-                device_name = device.name or "Unknown"
-                logger.info(f"Found device: {device_name}, Address: {device.address}")
-                if "_L_" in device_name and not self.left_glass:
-                    self.left_glass = Glass(name=device_name, address=device.address, side="left")
-                elif "_R_" in device_name and not self.right_glass:
-                    self.right_glass = Glass(name=device_name, address=device.address, side="right")
-
-            connect_tasks = []
-            if self.left_glass:
-                connect_tasks.append(asyncio.create_task(self.left_glass.connect()))
-            if self.right_glass:
-                connect_tasks.append(asyncio.create_task(self.right_glass.connect()))
+            cached = self.device_cache.get() if self.device_cache else None
+            for side in ("left", "right"):
+                entry = getattr(cached, side, None)
+                if entry and not getattr(self, f"{side}_glass"):
+                    logger.info(f"Trying cached {side} glass {entry.name} ({entry.address})")
+                    setattr(self, f"{side}_glass", self._create_glass(entry.name, entry.address, side))
+
+            scan_done = asyncio.Event()
+            connect_tasks: List[asyncio.Task] = []
+            # Cached arms not yet confirmed by a successful connect
+            cached_sides = {
+                glass.side
+                for glass in (self.left_glass, self.right_glass)
+                if glass and getattr(cached, glass.side, None)
+                and glass.address == getattr(cached, glass.side).address
+            }
+
+            def check_scan_done():
+                if self.left_glass and self.right_glass and not cached_sides:
+                    scan_done.set()
+
+            async def connect_side(glass: Glass):
+                try:
+                    await glass.connect()
+                except Exception:
+                    if glass.side not in cached_sides:
+                        scan_done.set()  # No point waiting out the timeout
+                        raise
+                    # Stale cache entry: forget it and let the scan find the arm
+                    logger.warning(f"Cached {glass.side} glass {glass.name} unreachable")
+                    cached_sides.discard(glass.side)
+                    self.device_cache.invalidate(glass.side, glass.name)
+                    if getattr(self, f"{glass.side}_glass") is glass:
+                        setattr(self, f"{glass.side}_glass", None)
+                    return
+                cached_sides.discard(glass.side)
+                if self.device_cache:
+                    self.device_cache.put(glass.side, glass.name, glass.address)
+                check_scan_done()
+
+            def start_connect(glass: Glass):
+                connect_tasks.append(asyncio.create_task(connect_side(glass)))
+
+            for glass in (self.left_glass, self.right_glass):
+                if glass:
+                    start_connect(glass)
+
+            # Glasses given as addresses are trusted; cached ones may be stale
+            if not (self.left_glass and self.right_glass) or cached_sides:
+
+                def on_detect(device, advertisement_data):
+                    glass = self.add_detected(device, advertisement_data)
+                    if glass:
+                        start_connect(glass)
+                        check_scan_done()
+
+                logger.info("Scanning for glasses devices...")
+                scanner = self.scanner(detection_callback=on_detect)
+                await scanner.start()
+                try:
+                    await asyncio.wait_for(scan_done.wait(), timeout)
+                except asyncio.TimeoutError:
+                    logger.warning("Scan timed out before both glasses were found.")
+                finally:
+                    await scanner.stop()
 
             if connect_tasks:
                 await asyncio.gather(*connect_tasks)
+            glasses = [g for g in (self.left_glass, self.right_glass) if g]
+            if glasses and all(g.client.is_connected for g in glasses):
                 logger.info("All glasses connected successfully.")
                 return True
+            elif glasses:
+                logger.error("Failed to connect to all glasses.")
+                return False
             else:
                 logger.error("No glasses devices found during scan.")
                 return False
@@ -211,13 +747,111 @@ class GlassesManager:
             logger.error(f"Error during scan and connect: {e}")
             return False
 
+    def subscribe(self, command: int, handler: Handler):
+        """Subscribe to an opcode on both glasses, including ones found later.
+
+        Events carry the originating Glass in `event.source`.
+        """
+        self._subscriptions.append((command, handler))
+        for glass in (self.left_glass, self.right_glass):
+            if glass:
+                glass.subscribe(command, handler)
+
+    def unsubscribe(self, command: int, handler: Handler):
+        self._subscriptions = [
+            s for s in self._subscriptions if s != (command, handler)
+        ]
+        for glass in (self.left_glass, self.right_glass):
+            if glass:
+                glass.unsubscribe(command, handler)
+
+    def add_state_listener(self, listener: StateListener):
+        """Call `listener(glass, state)` when either glass changes connection state.
+
+        Also applies to glasses found by later scans.
+        """
+        self._state_listeners.append(listener)
+        for glass in (self.left_glass, self.right_glass):
+            if glass:
+                glass.add_state_listener(listener)
+
+    def remove_state_listener(self, listener: StateListener):
+        if listener in self._state_listeners:
+            self._state_listeners.remove(listener)
+        for glass in (self.left_glass, self.right_glass):
+            if glass:
+                glass.remove_state_listener(listener)
+
+    async def start_mic(self, capacity: int = 512) -> Optional[MicReceiver]:
+        """Start recording from the right glass' microphone."""
+        if not self.right_glass:
+            logger.error("Mic audio needs the right glass to be connected.")
+            return None
+        return await self.right_glass.start_mic(capacity=capacity)
+
+    async def stop_mic(self):
+        if self.right_glass:
+            await self.right_glass.stop_mic()
+
+    @property
+    def notifications(self) -> NotificationQueue:
+        """Managed notification queue; `manager.notifications.put(n)` to send."""
+        if self._notifications is None:
+            self._notifications = NotificationQueue(self)
+        return self._notifications
+
+    def enable_streaming(self, window: int = 8):
+        """Enable windowed write-without-response on both glasses."""
+        self.stream_window = window
+        for glass in (self.left_glass, self.right_glass):
+            if glass:
+                glass.enable_streaming(window)
+
+    @property
+    def max_write_size(self) -> int:
+        """Largest write both glasses accept."""
+        glasses = [glass for glass in (self.left_glass, self.right_glass) if glass]
+        if not glasses:
+            return DEFAULT_MTU - ATT_HEADER_SIZE
+        return min(glass.max_write_size for glass in glasses)
+
+    def disable_streaming(self):
+        """Confirm every write on both glasses again."""
+        self.stream_window = 0
+        for glass in (self.left_glass, self.right_glass):
+            if glass:
+                glass.disable_streaming()
+
+    def start_capture(self, sink) -> ProtocolCapture:
+        """Record every frame to and from both glasses to a file path or binary file.
+
+        Replay the capture with `python -m even_glasses.replay run <path>`.
+        """
+        self.stop_capture()
+        self.capture = ProtocolCapture(sink)
+        for glass in (self.left_glass, self.right_glass):
+            if glass:
+                glass.capture = self.capture.channel(glass.name)
+        return self.capture
+
+    def stop_capture(self):
+        if self.capture is None:
+            return
+        for glass in (self.left_glass, self.right_glass):
+            if glass:
+                glass.capture = None
+        self.capture.close()
+        self.capture = None
+
     async def disconnect_all(self):
-        """Disconnect from all connected glasses."""
-        disconnect_tasks = []
-        if self.left_glass and self.left_glass.client.is_connected:
-            disconnect_tasks.append(asyncio.create_task(self.left_glass.disconnect()))
-        if self.right_glass and self.right_glass.client.is_connected:
-            disconnect_tasks.append(asyncio.create_task(self.right_glass.disconnect()))
+        """Disconnect from all glasses, including any that are reconnecting."""
+        if self._notifications:
+            await self._notifications.stop()
+        disconnect_tasks = [
+            asyncio.create_task(glass.disconnect())
+            for glass in (self.left_glass, self.right_glass)
+            if glass
+        ]
         if disconnect_tasks:
             await asyncio.gather(*disconnect_tasks)
             logger.info("All glasses disconnected.")
@@ -241,4 +875,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(main())
\ No newline at end of file
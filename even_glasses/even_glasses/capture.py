@@ -0,0 +1,171 @@
+"""Binary capture of the frames exchanged with the glasses, and replay.
+
+A capture is a header followed by append-only records:
+
+    header:  b"EGCAP", version (u8), start time (f64, unix seconds)
+    record:  offset (u64, microseconds since start), kind (u8),
+             device (u8), length (u16), payload
+
+`kind` is KIND_DEVICE (payload is the device name, numbered in order of
+appearance), KIND_OUT (written to the device) or KIND_IN (notified by it).
+A record cut short by a crash is ignored when reading.
+
+Record with `GlassesManager.start_capture()`; inspect and replay with
+even_glasses.replay.
+"""
+import logging
+import struct
+import time
+from typing import BinaryIO, Dict, Iterator, NamedTuple, Optional, Union
+
+from even_glasses.metrics import command_label
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"EGCAP"
+VERSION = 1
+HEADER = struct.Struct("<5sBd")
+RECORD = struct.Struct("<QBBH")
+
+KIND_DEVICE = 0
+KIND_OUT = 1
+KIND_IN = 2
+
+MAX_DEVICES = 256
+MAX_PAYLOAD = 0xFFFF
+
+
+class CaptureChannel:
+    """One device's handle on a ProtocolCapture; set as `BleDevice.capture`."""
+
+    __slots__ = ("capture", "device")
+
+    def __init__(self, capture: "ProtocolCapture", device: int):
+        self.capture = capture
+        self.device = device
+
+    def outbound(self, data: bytes):
+        self.capture.write(KIND_OUT, self.device, data)
+
+    def inbound(self, data: bytes):
+        self.capture.write(KIND_IN, self.device, data)
+
+
+class ProtocolCapture:
+    """Append timestamped frames to a capture file.
+
+    Records go through a buffered file, so writing one on the hot path is a
+    struct pack and two buffer appends. Use as a context manager or call
+    `close()` to flush the tail.
+    """
+
+    def __init__(self, sink: Union[str, BinaryIO], buffering: int = 64 * 1024):
+        if isinstance(sink, str):
+            self.path: Optional[str] = sink
+            self._file = open(sink, "wb", buffering=buffering)
+            self._owns_file = True
+        else:
+            self.path = getattr(sink, "name", None)
+            self._file = sink
+            self._owns_file = False
+        self.started = time.time()
+        self._origin = time.perf_counter()
+        self._channels: Dict[str, CaptureChannel] = {}
+        self.frames = 0
+        self.bytes = 0
+        self.closed = False
+        self._file.write(HEADER.pack(MAGIC, VERSION, self.started))
+
+    def channel(self, name: str) -> CaptureChannel:
+        """Channel for the device called `name`, registering it on first use."""
+        channel = self._channels.get(name)
+        if channel is None:
+            if len(self._channels) >= MAX_DEVICES:
+                raise ValueError(f"A capture holds at most {MAX_DEVICES} devices")
+            channel = CaptureChannel(self, len(self._channels))
+            self._channels[name] = channel
+            self.write(KIND_DEVICE, channel.device, name.encode("utf-8"))
+        return channel
+
+    def write(self, kind: int, device: int, data: bytes):
+        if self.closed:
+            return
+        length = len(data)
+        if length > MAX_PAYLOAD:
+            data, length = data[:MAX_PAYLOAD], MAX_PAYLOAD
+        offset = int((time.perf_counter() - self._origin) * 1_000_000)
+        self._file.write(RECORD.pack(offset, kind, device, length))
+        self._file.write(data)
+        if kind != KIND_DEVICE:
+            self.frames += 1
+            self.bytes += length
+
+    def flush(self):
+        if not self.closed:
+            self._file.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        self._file.flush()
+        self.closed = True
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> "ProtocolCapture":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CapturedFrame(NamedTuple):
+    time: float  # Seconds since the capture started
+    kind: int
+    device: str
+    data: bytes
+
+
+def read_capture(source: Union[str, BinaryIO]) -> Iterator[CapturedFrame]:
+    """Yield the frames of a capture in order, skipping a truncated tail."""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            yield from read_capture(f)
+        return
+    header = source.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError("Not a capture file: header is truncated")
+    magic, version, _ = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Not a capture file: bad magic")
+    if version != VERSION:
+        raise ValueError(f"Unsupported capture version {version}")
+    devices: Dict[int, str] = {}
+    while True:
+        raw = source.read(RECORD.size)
+        if len(raw) < RECORD.size:
+            return
+        offset, kind, device, length = RECORD.unpack(raw)
+        data = source.read(length)
+        if len(data) < length:
+            return
+        if kind == KIND_DEVICE:
+            devices[device] = data.decode("utf-8", errors="replace")
+            continue
+        yield CapturedFrame(offset / 1_000_000, kind, devices.get(device, f"device{device}"), data)
+
+
+def capture_info(path: str) -> dict:
+    """Frame, byte and per-command counts of a capture."""
+    with open(path, "rb") as f:
+        _, _, started = HEADER.unpack(f.read(HEADER.size))
+    summary = {"started": started, "duration": 0.0, "devices": {}, "out": 0, "in": 0, "bytes": 0}
+    for frame in read_capture(path):
+        direction = "out" if frame.kind == KIND_OUT else "in"
+        summary[direction] += 1
+        summary["bytes"] += len(frame.data)
+        summary["duration"] = frame.time
+        commands = summary["devices"].setdefault(frame.device, {})
+        label = f"{direction} {command_label(frame.data[0])}" if frame.data else f"{direction} empty"
+        commands[label] = commands.get(label, 0) + 1
+    return summary
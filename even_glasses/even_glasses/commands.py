@@ -1,25 +1,40 @@
 from even_glasses.models import (
-    Command,
     SubCommand,
     MicStatus,
     SendResult,
     ScreenAction,
     AIStatus,
     RSVPConfig,
+    RSVPStats,
     NCSNotification,
 )
 import asyncio
 import logging
-from typing import List
-from even_glasses.utils import construct_notification
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional, Tuple, Union
+from even_glasses.page_cache import CompiledText, PageCache
+from even_glasses.scheduler import FrameScheduler
+from even_glasses.text_layout import TextLayout, default_layout
+from even_glasses.text_sources import TextSource, iter_words
+from even_glasses.encoders import (
+    DISPLAY_COMPLETE,
+    SendResultPacket,
+    encode_mic_command,
+    encode_notification,
+    encode_start_ai,
+)
+
+LINES_PER_PAGE = 5
+
+# Shared by send_text calls that do not pass their own cache
+text_cache = PageCache()
 
 
 def construct_start_ai(subcmd: SubCommand, param: bytes = b"") -> bytes:
-    return bytes([Command.START_AI, subcmd]) + param
+    return encode_start_ai(subcmd, param)
 
 
 def construct_mic_command(enable: MicStatus) -> bytes:
-    return bytes([Command.OPEN_MIC, enable])
+    return encode_mic_command(enable)
 
 
 def construct_result(result: SendResult) -> bytes:
@@ -44,6 +59,21 @@ def format_text_lines(text: str) -> list:
     return lines
 
 
+async def send_to_both(
+    manager, data: Union[bytes, memoryview, List[bytes]], timeout: float = 1.0
+) -> bool:
+    """Send data to the left arm, then to the right once the left has acknowledged.
+
+    `data` may be a list of packets; they are written back-to-back and
+    acknowledged together. If ACKs do not arrive within `timeout` seconds the
+    send moves on anyway, so a silent arm costs at most `timeout`.
+    """
+    packets = data if isinstance(data, list) else [data]
+    left_ok = await manager.left_glass.send_and_wait_many(packets, timeout=timeout)
+    right_ok = await manager.right_glass.send_and_wait_many(packets, timeout=timeout)
+    return left_ok and right_ok
+
+
 async def send_text_packet(
     manager,
     text_message: str,
@@ -56,69 +86,90 @@ async def send_text_packet(
 ) -> str:
     text_bytes = text_message.encode("utf-8")
 
-    result = SendResult(
-        seq=seq,
-        total_packages=1,
-        current_package=0,
-        screen_status=screen_status,
-        new_char_pos0=0,
-        new_char_pos1=0,
+    result = SendResultPacket(
+        text_bytes,
         page_number=page_number,
         max_pages=max_pages,
-        data=text_bytes,
+        screen_status=screen_status,
+        seq=seq,
     )
-    ai_result_command = result.build()
 
     if manager.left_glass and manager.right_glass:
-        # Send to the left glass and wait for acknowledgment
-        await manager.left_glass.send(ai_result_command)
-        await asyncio.sleep(delay)
-        # Send to the right glass and wait for acknowledgment
-        await manager.right_glass.send(ai_result_command)
-        await asyncio.sleep(delay)
-        
+        packets = result.fragment(manager.max_write_size)
+        # Left first, right as soon as the left ACKs; `delay` bounds each wait
+        await send_to_both(manager, packets, timeout=delay)
         return text_message
     else:
         logging.error("Could not connect to glasses devices.")
         return False
 
 
-async def send_text(manager, text_message: str, duration: float = 5) -> str:
-    lines = format_text_lines(text_message)
-    total_pages = (len(lines) + 4) // 5  # 5 lines per page
-
-    for pn, page in enumerate(range(0, len(lines), 5), start=1):
-        page_lines = lines[page : page + 5]
+def paginate_lines(lines: List[str], lines_per_page: int = LINES_PER_PAGE) -> List[str]:
+    """Join lines into pages, vertically centering pages that are not full."""
+    pages = []
+    for page in range(0, len(lines), lines_per_page):
+        page_lines = lines[page : page + lines_per_page]
 
         # Add vertical centering for pages with fewer than 5 lines
-        if len(page_lines) < 5:
-            padding = (5 - len(page_lines)) // 2
+        if len(page_lines) < lines_per_page:
+            padding = (lines_per_page - len(page_lines)) // 2
             page_lines = (
-                [""] * padding + page_lines + [""] * (5 - len(page_lines) - padding)
+                [""] * padding
+                + page_lines
+                + [""] * (lines_per_page - len(page_lines) - padding)
             )
+        pages.append("\n".join(page_lines))
+    return pages
 
-        text = "\n".join(page_lines)
-        screen_status = ScreenAction.NEW_CONTENT | AIStatus.DISPLAYING
 
-        await send_text_packet(
-            manager=manager,
-            text_message=text,
-            page_number=pn,
-            max_pages=total_pages,
-            screen_status=screen_status,
-        )
+def compile_text(
+    text_message: str,
+    max_packet_size: int,
+    layout: TextLayout = default_layout,
+) -> CompiledText:
+    """Lay out text and encode every page into ready-to-send packets."""
+    pages = paginate_lines(layout.wrap(text_message))
+    total_pages = len(pages)
+    compiled_pages = []
+    for pn, page in enumerate(pages, start=1):
+        packet = SendResultPacket(page.encode("utf-8"), pn, total_pages)
+        compiled_pages.append(packet.fragment(max_packet_size))
+
+    final = []
+    if pages:
+        packet.screen_status = DISPLAY_COMPLETE
+        final = packet.fragment(max_packet_size)
+    return CompiledText(compiled_pages, final)
+
+
+async def send_text(
+    manager,
+    text_message: str,
+    duration: float = 5,
+    cache: Optional[PageCache] = text_cache,
+    delay: float = 0.4,
+    layout: TextLayout = default_layout,
+) -> str:
+    """Display text page by page; repeated texts are served from `cache`."""
+    if not manager.left_glass or not manager.right_glass:
+        logging.error("Could not connect to glasses devices.")
+        return False
+
+    max_packet_size = manager.max_write_size
+    key = (text_message, max_packet_size, layout)
+    compiled = cache.get(key) if cache is not None else None
+    if compiled is None:
+        compiled = compile_text(text_message, max_packet_size, layout)
+        if cache is not None:
+            cache.put(key, compiled)
+
+    total_pages = len(compiled.pages)
+    for pn, packets in enumerate(compiled.pages, start=1):
+        await send_to_both(manager, packets, timeout=delay)
         if pn != 1 and total_pages != 1:
             await asyncio.sleep(duration)
-        if pn == total_pages:
-            screen_status = ScreenAction.NEW_CONTENT | AIStatus.DISPLAY_COMPLETE
-
-            await send_text_packet(
-                manager=manager,
-                text_message=text,
-                page_number=pn,
-                max_pages=total_pages,
-                screen_status=screen_status,
-            )
+    if compiled.final:
+        await send_to_both(manager, compiled.final, timeout=delay)
     return text_message
 
 
@@ -126,50 +177,227 @@ def group_words(words: List[str], config: RSVPConfig) -> List[str]:
     """Group words according to configuration"""
     groups = []
     for i in range(0, len(words), config.words_per_group):
-        group = words[i : i + config.words_per_group]
-        if len(group) < config.words_per_group:
-            group.extend([config.padding_char] * (config.words_per_group - len(group)))
-        groups.append(" ".join(group))
+        groups.append(_join_group(words[i : i + config.words_per_group], config))
     return groups
 
 
-async def send_rsvp(manager, text: str, config: RSVPConfig):
+async def agroup_words(words: AsyncIterable[str], config: RSVPConfig) -> AsyncIterator[str]:
+    """Group words from an async stream as they arrive, like group_words."""
+    async for group, _ in _agroup_counted(words, config):
+        yield group
+
+
+async def _agroup_counted(
+    words: AsyncIterable[str], config: RSVPConfig
+) -> AsyncIterator[Tuple[str, int]]:
+    # Yields (group text, real words in it); padding is not counted
+    group = []
+    async for word in words:
+        group.append(word)
+        if len(group) == config.words_per_group:
+            yield _join_group(group, config), len(group)
+            group = []
+    if group:
+        yield _join_group(group, config), len(group)
+
+
+def _join_group(group: List[str], config: RSVPConfig) -> str:
+    if len(group) < config.words_per_group:
+        group = group + [config.padding_char] * (config.words_per_group - len(group))
+    return " ".join(group)
+
+
+class RSVPFrame:
+    """One RSVP frame: its text and, when pre-rendered, the packets to write."""
+
+    __slots__ = ("text", "words", "packets")
+
+    def __init__(
+        self, text: str, packets: Optional[List[bytes]] = None, words: Optional[int] = None
+    ):
+        self.text = text
+        # Words shown, without the padding that fills a short last group
+        self.words = len(text.split()) if words is None else words
+        self.packets = packets or None
+
+
+def render_text_frame(
+    text: str, max_packet_size: int, layout: TextLayout = default_layout
+) -> List[bytes]:
+    """Encode text as a single displaying frame, without a completion packet."""
+    pages = paginate_lines(layout.wrap(text))
+    packets = []
+    for pn, page in enumerate(pages, start=1):
+        packet = SendResultPacket(page.encode("utf-8"), pn, len(pages))
+        packets.extend(packet.fragment(max_packet_size))
+    return packets
+
+
+def render_rsvp_frame(
+    group: str,
+    max_packet_size: int,
+    layout: TextLayout = default_layout,
+    words: Optional[int] = None,
+) -> RSVPFrame:
+    """Render one word group into a ready-to-write RSVP frame.
+
+    Frames carry only the displaying packet(s); playback writes the bytes
+    as-is and sends a single completion when the display is cleared.
+    """
+    if not group:
+        return RSVPFrame(group, words=0)
+    return RSVPFrame(group, render_text_frame(group, max_packet_size, layout), words)
+
+
+def render_rsvp_frames(
+    word_groups: Iterable[str],
+    max_packet_size: int,
+    layout: TextLayout = default_layout,
+) -> Iterator[RSVPFrame]:
+    """Lazily render word groups into ready-to-write RSVP frames."""
+    for group in word_groups:
+        yield render_rsvp_frame(group, max_packet_size, layout)
+
+
+async def _rsvp_frames(
+    source: TextSource, config: RSVPConfig, max_packet_size: int
+) -> AsyncIterator[RSVPFrame]:
+    # Blank padding groups lead in before the first words
+    for _ in range(config.words_per_group - 1):
+        yield RSVPFrame("")
+    async for group, words in _agroup_counted(iter_words(source), config):
+        if config.prerender:
+            yield render_rsvp_frame(group, max_packet_size, words=words)
+        else:
+            yield RSVPFrame(group, words=words)
+
+
+def rsvp_duration(text: str, config: RSVPConfig) -> float:
+    """Planned playback time of `text`, including the lead-in padding groups."""
+    groups = -(-len(text.split()) // config.words_per_group)
+    slots = groups + config.words_per_group - 1
+    return slots * 60 / config.wpm * config.words_per_group
+
+
+async def send_rsvp(manager, text: TextSource, config: RSVPConfig) -> bool:
     """Display text using RSVP method with improved error handling"""
-    if not text:
-        logging.warning("Empty text provided")
-        return False
+    stats = await play_rsvp(manager, text, config)
+    return stats.completed
 
-    try:
-        
-        # default delay is 01 second we are adding below to that so we need to calculate the delay
-        screen_delay = 60 / config.wpm
-        logging.info(f"Words screen change delay: {screen_delay}")
-        delay = min(screen_delay - 0.1 , 0.1) # Delay between words set min to 0.1
-        words = text.split()
-        if not words:
-            logging.warning("No words to display after splitting")
-            return False
 
-        # Add padding groups for initial display
-        padding_groups = [""] * (config.words_per_group - 1)
-        word_groups = padding_groups + group_words(words, config)
+async def play_rsvp(manager, text: TextSource, config: RSVPConfig) -> RSVPStats:
+    """Display text using RSVP and return timing statistics.
 
-        for group in word_groups:
-            if not group:  # Skip empty padding groups
-                await asyncio.sleep(delay * config.words_per_group)
-                continue
+    `text` may be a str, an open file or stream, or an async iterable of text
+    chunks; words are tokenized and grouped as they arrive, so memory stays
+    constant regardless of input length.
 
-            success = await send_text(manager, group)
-            if not success:
-                logging.error(f"Failed to display group: {group}")
-                return False
+    Frames follow absolute deadlines on the monotonic clock, so send time does
+    not add up over the run. When the link falls behind, late frames are
+    merged or skipped according to `config.late_policy`. Time spent waiting on
+    a slow source postpones the schedule rather than counting as lateness.
+    """
+    stats = RSVPStats(target_wpm=config.wpm)
+    if not manager.left_glass or not manager.right_glass:
+        logging.error("Could not connect to glasses devices.")
+        return stats
+    if isinstance(text, str) and not text:
+        logging.warning("Empty text provided")
+        return stats
+
+    padding = config.words_per_group - 1
+    frames = _rsvp_frames(text, config, manager.max_write_size)
+    scheduler = FrameScheduler(60 / config.wpm * config.words_per_group)
+    logging.info(f"Words screen change delay: {scheduler.interval}")
+
+    # A producer keeps a few frames ready so late frames can be merged or
+    # skipped, and so a slow source never holds up a frame that is already due
+    ready: asyncio.Queue = asyncio.Queue(maxsize=config.max_merge + 1)
+
+    async def produce():
+        async for frame in frames:
+            await ready.put(frame)
+
+    async def next_frame() -> Optional[RSVPFrame]:
+        # None once the producer has finished (or failed) and the queue is drained
+        if not ready.empty() or producer.done():
+            return ready.get_nowait() if not ready.empty() else None
+        getter = asyncio.ensure_future(ready.get())
+        try:
+            await asyncio.wait((getter, producer), return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            getter.cancel()
+            raise
+        if getter.done():
+            return getter.result()
+        getter.cancel()
+        return ready.get_nowait() if not ready.empty() else None
+
+    async def take_frame(index: int) -> Optional[RSVPFrame]:
+        wait_started = scheduler.clock()
+        frame = await next_frame()
+        # If the source made this frame late, shift the schedule instead
+        due = scheduler.deadline(index) - scheduler.send_estimate
+        stall = scheduler.clock() - max(wait_started, due)
+        if stall > 0:
+            scheduler.delay_by(stall)
+        return frame
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        scheduler.start()
+        index = 0
+        while True:
+            frame = await take_frame(index)
+            if frame is None:
+                break
+
+            # Late frames are skipped or merged, using only frames already read
+            behind = scheduler.frames_behind(index) if config.late_policy != "none" else 0
+            merged = [frame]
+            while behind and not ready.empty() and len(merged) < config.max_merge:
+                upcoming = ready.get_nowait()
+                index += 1  # The frame takes the slot of the last group it replaces
+                behind -= 1
+                if config.late_policy == "skip":
+                    stats.frames_skipped += 1
+                    merged[0] = upcoming
+                else:
+                    stats.frames_merged += 1
+                    merged.append(upcoming)
+            frame = merged[0]
+            if len(merged) > 1:
+                merged_text = " ".join(f.text for f in merged if f.text)
+                packets = None
+                if config.prerender:
+                    packets = render_text_frame(merged_text, manager.max_write_size)
+                frame = RSVPFrame(merged_text, packets, sum(f.words for f in merged))
+
+            await scheduler.wait(index)
+            if frame.text:  # Empty padding groups only hold their slot
+                send_started = scheduler.clock()
+                if frame.packets:
+                    await send_to_both(manager, frame.packets)
+                elif not await send_text(manager, frame.text, duration=0, cache=None):
+                    logging.error(f"Failed to display group: {frame.text}")
+                    await send_text(manager, "--")
+                    return stats
+                scheduler.record(index, send_started)
+                stats.frames_sent += 1
+                stats.words_displayed += frame.words
+            index += 1
+
+        if not stats.frames_sent:
+            logging.warning("No words to display after splitting")
+            return stats
 
-            await asyncio.sleep(delay * config.words_per_group)
+        # Keep the last group up for its full slot
+        await scheduler.wait(index)
+        stats.elapsed = scheduler.clock() - scheduler.deadline(padding)
+        stats.completed = True
 
         # Clear display
         await send_text(manager, "--")
-        return True
-
     except asyncio.CancelledError:
         logging.info("RSVP display cancelled")
         await send_text(manager, "--")  # Clear display on cancellation
@@ -177,15 +405,41 @@ async def send_rsvp(manager, text: str, config: RSVPConfig):
     except Exception as e:
         logging.error(f"Error in RSVP display: {e}")
         await send_text(manager, "--")  # Try to clear display
-        return False
-    
+        stats.completed = False
+    finally:
+        producer.cancel()
+        try:
+            await producer
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logging.error(f"Error reading RSVP text: {e}")
+            stats.completed = False
+        await frames.aclose()
+        if stats.elapsed > 0:
+            stats.achieved_wpm = stats.words_displayed / stats.elapsed * 60
+        stats.mean_jitter = scheduler.mean_jitter
+        stats.max_jitter = scheduler.max_jitter
+        stats.jitter_stddev = scheduler.jitter_stddev
+
+    logging.info(
+        f"RSVP achieved {stats.achieved_wpm:.0f}/{stats.target_wpm} WPM, "
+        f"mean jitter {stats.mean_jitter * 1000:.1f} ms, "
+        f"{stats.frames_merged} merged, {stats.frames_skipped} skipped"
+    )
+    return stats
 
 
-async def send_notification(manager, notification: NCSNotification):
+async def send_notification(
+    manager, notification: NCSNotification, timeout: float = 1.0
+) -> bool:
     """Send a notification to the glasses."""
-    notification_chunks = await construct_notification(notification)
-    for chunk in notification_chunks:
-            await manager.left_glass.send(chunk)
-            await manager.right_glass.send(chunk)
-            print(f"Sent chunk to glasses: {chunk}")
-            await asyncio.sleep(0.01)  # Small delay between chunks
\ No newline at end of file
+    if not manager.left_glass or not manager.right_glass:
+        logging.error("Could not connect to glasses devices.")
+        return False
+
+    notification_chunks = encode_notification(
+        notification, max_packet_size=manager.max_write_size
+    )
+    # Chunks are pipelined to each arm and acknowledged together
+    return await send_to_both(manager, notification_chunks, timeout=timeout)
\ No newline at end of file
@@ -0,0 +1,101 @@
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".even_glasses", "devices.json")
+
+# "Even G1_42_L_ABC123" -> pairing "42"
+PAIRING_PATTERN = re.compile(r"_(\d+)_[LR]_")
+
+
+def pairing_key(name: Optional[str]) -> str:
+    """Pairing (serial) a glass belongs to, taken from its advertised name."""
+    match = PAIRING_PATTERN.search(name or "")
+    return match.group(1) if match else "default"
+
+
+class CachedDevice(BaseModel):
+    name: str
+    address: str
+
+
+class CachedPairing(BaseModel):
+    left: Optional[CachedDevice] = None
+    right: Optional[CachedDevice] = None
+    updated: float = Field(default_factory=time.time)
+
+
+class DeviceCache:
+    """Last known left/right addresses per pairing, persisted as JSON.
+
+    Lets GlassesManager connect straight to known glasses on startup instead
+    of waiting for a scan. Entries that fail to connect are invalidated.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self._pairings: Optional[Dict[str, CachedPairing]] = None
+
+    @property
+    def pairings(self) -> Dict[str, CachedPairing]:
+        if self._pairings is None:
+            self._pairings = self._load()
+        return self._pairings
+
+    def _load(self) -> Dict[str, CachedPairing]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {key: CachedPairing(**value) for key, value in data.items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError, ValidationError) as e:
+            logger.warning(f"Ignoring unreadable device cache {self.path}: {e}")
+            return {}
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {key: pairing.model_dump() for key, pairing in self.pairings.items()}
+        # Write then rename so a crash never leaves a truncated cache
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write device cache {self.path}: {e}")
+
+    def get(self, pairing: Optional[str] = None) -> Optional[CachedPairing]:
+        """Cached pairing by key, or the most recently used one."""
+        if pairing is not None:
+            return self.pairings.get(pairing)
+        if not self.pairings:
+            return None
+        return max(self.pairings.values(), key=lambda p: p.updated)
+
+    def put(self, side: str, name: str, address: str):
+        """Remember a glass that connected successfully."""
+        pairing = self.pairings.setdefault(pairing_key(name), CachedPairing())
+        setattr(pairing, side, CachedDevice(name=name, address=address))
+        pairing.updated = time.time()
+        self.save()
+
+    def invalidate(self, side: str, name: str):
+        """Forget a glass that could not be reached at its cached address."""
+        key = pairing_key(name)
+        pairing = self.pairings.get(key)
+        if pairing is None or getattr(pairing, side) is None:
+            return
+        setattr(pairing, side, None)
+        if pairing.left is None and pairing.right is None:
+            del self.pairings[key]
+        self.save()
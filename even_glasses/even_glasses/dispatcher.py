@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from typing import Callable, List, Optional, Tuple
+
+from even_glasses.models import Command, ResponseStatus
+
+logger = logging.getLogger(__name__)
+
+
+class PacketEvent:
+    """An incoming packet, typed by its leading Command byte.
+
+    Fields beyond `command` are read lazily from `data`, so building an event
+    costs one small object and no parsing.
+    """
+
+    __slots__ = ("source", "command", "data")
+
+    def __init__(self, source, command: int, data: bytes):
+        self.source = source
+        self.command = command
+        self.data = data
+
+    def __repr__(self) -> str:
+        name = getattr(self.source, "name", self.source)
+        return f"{type(self).__name__}({name}, 0x{self.command:02X}, {bytes(self.data).hex()})"
+
+
+class AckEvent(PacketEvent):
+    """Response to a command: [command, 0xC9 | 0xCA, ...]."""
+
+    __slots__ = ()
+
+    @property
+    def status(self) -> Optional[int]:
+        return self.data[1] if len(self.data) > 1 else None
+
+    @property
+    def success(self) -> bool:
+        return self.status == ResponseStatus.SUCCESS
+
+
+class AIEvent(PacketEvent):
+    """START_AI event from the glasses: [0xF5, subcommand, ...]."""
+
+    __slots__ = ()
+
+    @property
+    def subcommand(self) -> Optional[int]:
+        return self.data[1] if len(self.data) > 1 else None
+
+
+class HeartbeatEvent(PacketEvent):
+    """Heartbeat echo: [0x25, length (2 bytes), seq, 0x04, seq]."""
+
+    __slots__ = ()
+
+    @property
+    def seq(self) -> Optional[int]:
+        return self.data[3] if len(self.data) > 3 else None
+
+
+class MicDataEvent(PacketEvent):
+    """Microphone audio: [0xF1, seq, lc3 audio...].
+
+    For sync handlers, one instance per dispatcher is reused for every packet
+    and is only valid during the handler call; copy `audio` to keep it. If
+    the opcode has a coroutine subscriber, each packet gets its own event,
+    since that handler may still be awaiting when the next packet arrives.
+    """
+
+    __slots__ = ()
+
+    @property
+    def seq(self) -> int:
+        return self.data[1]
+
+    @property
+    def audio(self) -> memoryview:
+        return memoryview(self.data)[2:]
+
+
+Handler = Callable[[PacketEvent], object]
+
+# Event type for each known opcode; anything else arrives as a PacketEvent
+EVENT_TYPES = {
+    Command.START_AI: AIEvent,
+    Command.HEARTBEAT: HeartbeatEvent,
+    Command.RECEIVE_MIC_DATA: MicDataEvent,
+    Command.OPEN_MIC: AckEvent,
+    Command.INIT: AckEvent,
+    Command.SEND_RESULT: AckEvent,
+    Command.QUICK_NOTE: AckEvent,
+    Command.DASHBOARD: AckEvent,
+    Command.NOTIFICATION: AckEvent,
+}
+
+
+class PacketDispatcher:
+    """Route incoming packets to per-opcode subscribers.
+
+    Routing is a list lookup on the first byte. Opcodes without subscribers
+    are dropped before an event is built, and mic data reuses one event
+    object while only sync handlers listen, so the high-rate paths do no decoding, logging or allocation.
+    Handlers may be plain functions or coroutine functions.
+    """
+
+    def __init__(self, source=None):
+        self.source = source
+        # Per opcode: tuple of (handler, is_async); None when unsubscribed
+        self._routes: List[Optional[Tuple[Tuple[Handler, bool], ...]]] = [None] * 256
+        # Per opcode: whether any handler is a coroutine function
+        self._has_async = [False] * 256
+        self._mic_event = MicDataEvent(source, Command.RECEIVE_MIC_DATA, b"")
+
+    def subscribe(self, command: int, handler: Handler):
+        """Call `handler(event)` for every packet starting with `command`."""
+        route = self._routes[command] or ()
+        self._set_route(command, route + ((handler, asyncio.iscoroutinefunction(handler)),))
+
+    def unsubscribe(self, command: int, handler: Handler):
+        route = tuple(r for r in self._routes[command] or () if r[0] != handler)
+        self._set_route(command, route)
+
+    def _set_route(self, command: int, route: Tuple[Tuple[Handler, bool], ...]):
+        self._routes[command] = route or None
+        self._has_async[command] = any(is_async for _, is_async in route)
+
+    def has_subscribers(self, command: int) -> bool:
+        return self._routes[command] is not None
+
+    def event(self, data: bytes) -> PacketEvent:
+        command = data[0]
+        if command == Command.RECEIVE_MIC_DATA and not self._has_async[command]:
+            event = self._mic_event
+            event.data = data
+            return event
+        return EVENT_TYPES.get(command, PacketEvent)(self.source, command, data)
+
+    async def dispatch(self, data: bytes):
+        route = self._routes[data[0]]
+        if route is None:
+            return
+        event = self.event(data)
+        for handler, is_async in route:
+            try:
+                if is_async:
+                    await handler(event)
+                else:
+                    handler(event)
+            except Exception as e:
+                logger.error(f"Handler {handler!r} failed on {event!r}: {e}")
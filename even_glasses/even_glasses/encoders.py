@@ -0,0 +1,169 @@
+import json
+import struct
+from typing import Dict, List
+
+from even_glasses.models import (
+    AIStatus,
+    Command,
+    MicStatus,
+    NCSNotification,
+    ScreenAction,
+    SubCommand,
+    split_utf8,
+)
+
+# Precompiled headers of the packets we send. Payload bytes follow the header.
+HEADERS: Dict[Command, struct.Struct] = {
+    Command.START_AI: struct.Struct("BB"),  # command, subcmd
+    Command.OPEN_MIC: struct.Struct("BB"),  # command, enable
+    Command.HEARTBEAT: struct.Struct("<BHBBB"),  # command, length, seq, 0x04, seq
+    # command, seq, total, current, status, char_pos0, char_pos1, page, max_pages
+    Command.SEND_RESULT: struct.Struct("9B"),
+    Command.NOTIFICATION: struct.Struct("4B"),  # command, notify_id, total, index
+}
+
+START_AI_HEADER = HEADERS[Command.START_AI]
+OPEN_MIC_HEADER = HEADERS[Command.OPEN_MIC]
+SEND_RESULT_HEADER = HEADERS[Command.SEND_RESULT]
+HEARTBEAT_HEADER = HEADERS[Command.HEARTBEAT]
+NOTIFICATION_HEADER = HEADERS[Command.NOTIFICATION]
+NOTIFICATION_HEADER_SIZE = NOTIFICATION_HEADER.size
+
+DISPLAYING = ScreenAction.NEW_CONTENT | AIStatus.DISPLAYING
+DISPLAY_COMPLETE = ScreenAction.NEW_CONTENT | AIStatus.DISPLAY_COMPLETE
+
+
+class SendResultPacket:
+    """Lightweight SendResult encoder used on the send path.
+
+    Builds the same bytes as models.SendResult without pydantic validation.
+    """
+
+    __slots__ = (
+        "command",
+        "seq",
+        "screen_status",
+        "new_char_pos0",
+        "new_char_pos1",
+        "page_number",
+        "max_pages",
+        "data",
+    )
+
+    def __init__(
+        self,
+        data: bytes,
+        page_number: int = 1,
+        max_pages: int = 1,
+        screen_status: int = DISPLAYING,
+        seq: int = 0,
+        new_char_pos0: int = 0,
+        new_char_pos1: int = 0,
+        command: int = Command.SEND_RESULT,
+    ):
+        self.command = command
+        self.seq = seq
+        self.screen_status = screen_status
+        self.new_char_pos0 = new_char_pos0
+        self.new_char_pos1 = new_char_pos1
+        self.page_number = page_number
+        self.max_pages = max_pages
+        self.data = data
+
+    def build(self, total_packages: int = 1, current_package: int = 0, data=None) -> bytes:
+        return SEND_RESULT_HEADER.pack(
+            self.command,
+            self.seq,
+            total_packages,
+            current_package,
+            self.screen_status,
+            self.new_char_pos0,
+            self.new_char_pos1,
+            self.page_number,
+            self.max_pages,
+        ) + (self.data if data is None else data)
+
+    def fragment(self, max_packet_size: int) -> List[bytes]:
+        """Split data into numbered packages, like SendResult.fragment."""
+        chunk_size = max_packet_size - SEND_RESULT_HEADER.size
+        if len(self.data) <= chunk_size:
+            return [self.build()]  # Fast path: the common single package
+        if chunk_size < 4:
+            raise ValueError(f"Packet size {max_packet_size} is too small for a package")
+        chunks = split_utf8(self.data, chunk_size)
+        if len(chunks) > 255:
+            raise ValueError(f"Data needs {len(chunks)} packages, at most 255 allowed")
+        return [self.build(len(chunks), index, chunk) for index, chunk in enumerate(chunks)]
+
+
+def encode_start_ai(subcmd: SubCommand, param: bytes = b"") -> bytes:
+    return START_AI_HEADER.pack(Command.START_AI, subcmd) + param
+
+
+def encode_mic_command(enable: MicStatus) -> bytes:
+    return OPEN_MIC_HEADER.pack(Command.OPEN_MIC, enable)
+
+
+def encode_heartbeat(seq: int) -> bytes:
+    seq &= 0xFF
+    return HEARTBEAT_HEADER.pack(Command.HEARTBEAT, HEARTBEAT_HEADER.size, seq, 0x04, seq)
+
+
+_compact_json = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def notification_payload(ncs_notification: NCSNotification) -> bytes:
+    """Serialize a notification as compact JSON without a pydantic dump."""
+    n = ncs_notification
+    return _compact_json(
+        {
+            "ncs_notification": {
+                "msg_id": n.msg_id,
+                "type": n.type,
+                "app_identifier": n.app_identifier,
+                "title": n.title,
+                "subtitle": n.subtitle,
+                "message": n.message,
+                "time_s": n.time_s,
+                "date": n.date,
+                "display_name": n.display_name,
+            },
+            "type": "Add",
+        }
+    ).encode("utf-8")
+
+
+def frame_notification(
+    payload: bytes, max_packet_size: int = 180, notify_id: int = 0
+) -> List[memoryview]:
+    """Split a notification payload into frames backed by one buffer.
+
+    Headers and payload are written into a single preallocated bytearray and
+    the frames are memoryviews into it, so no per-chunk bytes are created.
+    """
+    chunk_size = max_packet_size - NOTIFICATION_HEADER_SIZE
+    total = max(1, -(-len(payload) // chunk_size))
+    if total > 255:
+        raise ValueError(f"Notification needs {total} chunks, at most 255 allowed")
+
+    buffer = bytearray(len(payload) + total * NOTIFICATION_HEADER_SIZE)
+    view = memoryview(buffer)
+    source = memoryview(payload)
+    frames = []
+    offset = 0
+    for index in range(total):
+        chunk = source[index * chunk_size : (index + 1) * chunk_size]
+        start = offset
+        NOTIFICATION_HEADER.pack_into(buffer, offset, Command.NOTIFICATION, notify_id, total, index)
+        offset += NOTIFICATION_HEADER_SIZE
+        view[offset : offset + len(chunk)] = chunk
+        offset += len(chunk)
+        frames.append(view[start:offset])
+    return frames
+
+
+def encode_notification(
+    ncs_notification: NCSNotification, max_packet_size: int = 180
+) -> List[memoryview]:
+    """Encode a notification into ready-to-send frames."""
+    return frame_notification(notification_payload(ncs_notification), max_packet_size)
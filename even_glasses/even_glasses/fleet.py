@@ -0,0 +1,191 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from bleak import BleakClient, BleakScanner
+
+from even_glasses.bluetooth_manager import Glass, GlassesManager, device_display_name
+from even_glasses.commands import rsvp_duration, send_notification, send_rsvp, send_text
+from even_glasses.device_cache import PAIRING_PATTERN
+from even_glasses.models import NCSNotification, RSVPConfig
+
+logger = logging.getLogger(__name__)
+
+
+class GlassesFleet:
+    """Drive many glasses pairs from one event loop.
+
+    One shared scanner pairs arms by the serial in their advertised name
+    (`Even G1_<serial>_L_...`) into a GlassesManager per pair, connecting each
+    arm as soon as it is seen. Broadcasts run on every pair concurrently;
+    each pair has its own write semaphore and timeout, so a slow or dropped
+    pair never holds up the others.
+    """
+
+    def __init__(
+        self,
+        client_factory: Optional[Callable[..., BleakClient]] = None,
+        scanner=BleakScanner,
+        max_concurrent_writes: int = 1,
+        send_timeout: float = 10.0,
+        serials: Optional[Iterable[str]] = None,
+    ):
+        self.client_factory = client_factory
+        self.scanner = scanner
+        self.max_concurrent_writes = max_concurrent_writes
+        self.send_timeout = send_timeout
+        # Only adopt these pairs when set, e.g. one shard of a WorkerPool
+        self.serials = set(serials) if serials is not None else None
+        self.pairs: Dict[str, GlassesManager] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._connect_tasks: List[asyncio.Task] = []
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def _pair(self, serial: str) -> GlassesManager:
+        manager = self.pairs.get(serial)
+        if manager is None:
+            manager = GlassesManager(client_factory=self.client_factory, scanner=self.scanner)
+            self.pairs[serial] = manager
+            self._semaphores[serial] = asyncio.Semaphore(self.max_concurrent_writes)
+        return manager
+
+    def connected_pairs(self) -> List[str]:
+        """Serials of pairs with both arms connected."""
+        return [
+            serial
+            for serial, manager in self.pairs.items()
+            if all(
+                glass and glass.client.is_connected
+                for glass in (manager.left_glass, manager.right_glass)
+            )
+        ]
+
+    async def _connect(self, serial: str, glass: Glass):
+        try:
+            await glass.connect()
+        except Exception as e:
+            logger.error(f"Pair {serial}: could not connect {glass.side} glass: {e}")
+
+    async def scan_and_connect(self, timeout: float = 10, expected_pairs: Optional[int] = None) -> int:
+        """Scan once for all pairs and connect every arm as it is detected.
+
+        Scanning stops after `timeout` seconds, or earlier once
+        `expected_pairs` pairs are fully connected. Returns the number of
+        fully connected pairs.
+        """
+        complete = asyncio.Event()
+
+        async def connect(serial: str, glass: Glass):
+            await self._connect(serial, glass)
+            if expected_pairs and len(self.connected_pairs()) >= expected_pairs:
+                complete.set()
+
+        def on_detect(device, advertisement_data):
+            match = PAIRING_PATTERN.search(device_display_name(device, advertisement_data))
+            if not match:
+                return
+            serial = match.group(1)
+            if self.serials is not None and serial not in self.serials:
+                return
+            glass = self._pair(serial).add_detected(device, advertisement_data)
+            if glass:
+                self._connect_tasks.append(asyncio.create_task(connect(serial, glass)))
+
+        logger.info("Scanning for glasses pairs...")
+        scanner = self.scanner(detection_callback=on_detect)
+        await scanner.start()
+        try:
+            await asyncio.wait_for(complete.wait(), timeout)
+        except asyncio.TimeoutError:
+            if expected_pairs:
+                logger.warning(
+                    f"Scan timed out with {len(self.connected_pairs())}/{expected_pairs} pairs connected"
+                )
+        finally:
+            await scanner.stop()
+
+        tasks, self._connect_tasks = self._connect_tasks, []
+        if tasks:
+            await asyncio.gather(*tasks)
+        connected = self.connected_pairs()
+        logger.info(f"{len(connected)} of {len(self.pairs)} pairs connected")
+        return len(connected)
+
+    async def run(
+        self,
+        serial: str,
+        command: Callable[..., Awaitable[Any]],
+        *args,
+        send_timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        """Run `command(manager, *args, **kwargs)` on one pair.
+
+        Holds the pair's write semaphore and gives up after `send_timeout`
+        (the fleet default if not given).
+        """
+        manager = self.pairs[serial]
+        timeout = self.send_timeout if send_timeout is None else send_timeout
+        async with self._semaphores[serial]:
+            return await asyncio.wait_for(command(manager, *args, **kwargs), timeout)
+
+    async def broadcast(
+        self,
+        command: Callable[..., Awaitable[Any]],
+        *args,
+        serials: Optional[Iterable[str]] = None,
+        send_timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Run a command on every connected pair (or `serials`) concurrently.
+
+        Returns the result per serial; a pair that failed or timed out maps
+        to its exception instead of raising.
+        """
+        targets = list(serials) if serials is not None else self.connected_pairs()
+        results = await asyncio.gather(
+            *(
+                self.run(serial, command, *args, send_timeout=send_timeout, **kwargs)
+                for serial in targets
+            ),
+            return_exceptions=True,
+        )
+        for serial, result in zip(targets, results):
+            if isinstance(result, asyncio.TimeoutError):
+                logger.warning(f"Pair {serial}: timed out")
+            elif isinstance(result, Exception):
+                logger.error(f"Pair {serial}: {result}")
+        return dict(zip(targets, results))
+
+    async def send_text(self, text: str, **kwargs) -> Dict[str, Any]:
+        return await self.broadcast(send_text, text, **kwargs)
+
+    async def send_rsvp(
+        self,
+        text: str,
+        config: Optional[RSVPConfig] = None,
+        send_timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Play RSVP on every pair.
+
+        Unless `send_timeout` is given, each pair gets the planned playback
+        time plus the fleet's send timeout.
+        """
+        config = config or RSVPConfig()
+        if send_timeout is None:
+            send_timeout = rsvp_duration(text, config) + self.send_timeout
+        return await self.broadcast(send_rsvp, text, config, send_timeout=send_timeout, **kwargs)
+
+    async def send_notification(self, notification: NCSNotification, **kwargs) -> Dict[str, Any]:
+        return await self.broadcast(send_notification, notification, **kwargs)
+
+    async def disconnect_all(self):
+        for task in self._connect_tasks:
+            task.cancel()
+        await asyncio.gather(
+            *(manager.disconnect_all() for manager in self.pairs.values()),
+            return_exceptions=True,
+        )
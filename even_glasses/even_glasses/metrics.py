@@ -0,0 +1,321 @@
+import asyncio
+import bisect
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from even_glasses.models import Command
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers sub-millisecond writes-without-response up to ACK timeouts
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Counter:
+    """Monotonic counter; `inc` is a single attribute add."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class Gauge:
+    """Value that can go up and down, e.g. writes waiting for the lock."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Histogram:
+    """Fixed-bucket histogram; `observe` is one bisect and three adds."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry:
+    """Named, labelled metrics exportable as a dict or Prometheus text.
+
+    Metrics are created once and kept by the caller, so updates on the hot
+    path never touch the registry.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Tuple[str, str, Dict[LabelKey, object]]] = {}
+        self._last_values: Dict[Tuple[str, LabelKey], float] = {}
+        self._last_snapshot = time.monotonic()
+
+    def _get(self, kind: str, name: str, help: str, labels: Dict[str, str], factory):
+        entry = self._metrics.get(name)
+        if entry is None:
+            entry = self._metrics[name] = (kind, help, {})
+        elif entry[0] != kind:
+            raise ValueError(f"Metric {name} is already registered as a {entry[0]}")
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        metric = entry[2].get(key)
+        if metric is None:
+            metric = entry[2][key] = factory()
+        return metric
+
+    def counter(self, name: str, help: str = "", **labels) -> Counter:
+        return self._get("counter", name, help, labels, Counter)
+
+    def gauge(self, name: str, help: str = "", **labels) -> Gauge:
+        return self._get("gauge", name, help, labels, Gauge)
+
+    def histogram(
+        self, name: str, help: str = "", buckets: Sequence[float] = LATENCY_BUCKETS, **labels
+    ) -> Histogram:
+        return self._get("histogram", name, help, labels, lambda: Histogram(buckets))
+
+    def clear(self):
+        self._metrics.clear()
+        self._last_values.clear()
+
+    def snapshot(self) -> Dict[str, List[dict]]:
+        """Current values; counters include their rate since the last snapshot."""
+        now = time.monotonic()
+        elapsed = now - self._last_snapshot
+        self._last_snapshot = now
+        result: Dict[str, List[dict]] = {}
+        for name, (kind, _, series) in self._metrics.items():
+            rows = []
+            for key, metric in series.items():
+                row = {"labels": dict(key)}
+                if kind == "histogram":
+                    row.update(
+                        count=metric.count,
+                        sum=metric.sum,
+                        mean=metric.sum / metric.count if metric.count else None,
+                        p50=metric.quantile(0.5),
+                        p90=metric.quantile(0.9),
+                        p99=metric.quantile(0.99),
+                    )
+                else:
+                    row["value"] = metric.value
+                    if kind == "counter":
+                        previous = self._last_values.get((name, key), 0)
+                        self._last_values[(name, key)] = metric.value
+                        row["rate"] = (metric.value - previous) / elapsed if elapsed > 0 else 0.0
+                rows.append(row)
+            result[name] = rows
+        return result
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, (kind, help, series) in self._metrics.items():
+            if help:
+                lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, metric in series.items():
+                if kind == "histogram":
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets + (float("inf"),), metric.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f"{name}_bucket{_labels(key, le=le)} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(key)} {metric.sum}")
+                    lines.append(f"{name}_count{_labels(key)} {metric.count}")
+                else:
+                    lines.append(f"{name}{_labels(key)} {metric.value}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(key: LabelKey, **extra) -> str:
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def command_label(opcode: int) -> str:
+    try:
+        return Command(opcode).name
+    except ValueError:
+        return f"0x{opcode:02X}"
+
+
+class DeviceMetrics:
+    """Pre-bound metrics for one BleDevice."""
+
+    __slots__ = (
+        "registry",
+        "device",
+        "write_latency",
+        "lock_wait",
+        "ack_rtt",
+        "pending_writes",
+        "bytes_sent",
+        "frames_sent",
+        "bytes_received",
+        "frames_received",
+        "write_errors",
+        "ack_timeouts",
+        "disconnects",
+        "reconnects",
+        "_tx_by_command",
+        "_rx_by_command",
+    )
+
+    def __init__(self, device: str, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry = registry or default_registry
+        self.device = device
+        self.write_latency = registry.histogram(
+            "even_glasses_write_seconds", "GATT write duration", device=device
+        )
+        self.lock_wait = registry.histogram(
+            "even_glasses_write_lock_wait_seconds", "Time waiting for the write lock", device=device
+        )
+        self.ack_rtt = registry.histogram(
+            "even_glasses_ack_rtt_seconds", "Request to acknowledgment round trip", device=device
+        )
+        self.pending_writes = registry.gauge(
+            "even_glasses_pending_writes", "Writes queued on the write lock", device=device
+        )
+        self.bytes_sent = registry.counter(
+            "even_glasses_sent_bytes_total", "Bytes written", device=device
+        )
+        self.frames_sent = registry.counter(
+            "even_glasses_sent_frames_total", "Packets written", device=device
+        )
+        self.bytes_received = registry.counter(
+            "even_glasses_received_bytes_total", "Bytes received", device=device
+        )
+        self.frames_received = registry.counter(
+            "even_glasses_received_frames_total", "Packets received", device=device
+        )
+        self.write_errors = registry.counter(
+            "even_glasses_write_errors_total", "Failed writes", device=device
+        )
+        self.ack_timeouts = registry.counter(
+            "even_glasses_ack_timeouts_total", "Acknowledgments that never arrived", device=device
+        )
+        self.disconnects = registry.counter(
+            "even_glasses_disconnects_total", "Unexpected disconnects", device=device
+        )
+        self.reconnects = registry.counter(
+            "even_glasses_reconnects_total", "Successful reconnects", device=device
+        )
+        self._tx_by_command: List[Optional[Counter]] = [None] * 256
+        self._rx_by_command: List[Optional[Counter]] = [None] * 256
+
+    def sent(self, data: bytes):
+        opcode = data[0]
+        counter = self._tx_by_command[opcode]
+        if counter is None:
+            counter = self._tx_by_command[opcode] = self.registry.counter(
+                "even_glasses_sent_commands_total",
+                "Packets written per command",
+                device=self.device,
+                command=command_label(opcode),
+            )
+        counter.value += 1
+        self.frames_sent.value += 1
+        self.bytes_sent.value += len(data)
+
+    def received(self, data: bytes):
+        opcode = data[0]
+        counter = self._rx_by_command[opcode]
+        if counter is None:
+            counter = self._rx_by_command[opcode] = self.registry.counter(
+                "even_glasses_received_commands_total",
+                "Packets received per command",
+                device=self.device,
+                command=command_label(opcode),
+            )
+        counter.value += 1
+        self.frames_received.value += 1
+        self.bytes_received.value += len(data)
+
+
+default_registry = MetricsRegistry()
+
+
+async def serve_metrics(
+    registry: Optional[MetricsRegistry] = None, host: str = "127.0.0.1", port: int = 9464
+) -> asyncio.AbstractServer:
+    """Serve /metrics (Prometheus text) and /metrics.json (snapshot) over HTTP.
+
+    Returns the server; close it with `server.close()`.
+    """
+    registry = registry or default_registry
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await asyncio.wait_for(reader.readline(), 5)
+            # Drain the headers; the request line is all we route on
+            while (await asyncio.wait_for(reader.readline(), 5)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request.decode("latin-1").split()
+            path = parts[1] if len(parts) > 1 else "/"
+            if path == "/metrics":
+                status, content_type = "200 OK", "text/plain; version=0.0.4"
+                body = registry.to_prometheus().encode("utf-8")
+            elif path == "/metrics.json":
+                status, content_type = "200 OK", "application/json"
+                body = json.dumps(registry.snapshot()).encode("utf-8")
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", b"Not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+                + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.warning(f"Metrics request failed: {e}")
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+    return server
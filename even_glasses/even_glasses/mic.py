@@ -0,0 +1,196 @@
+import asyncio
+import logging
+from typing import BinaryIO, Dict, Optional, Union
+
+from even_glasses.dispatcher import MicDataEvent
+
+logger = logging.getLogger(__name__)
+
+MIC_HEADER_SIZE = 2  # command, seq
+MIC_FRAME_SIZE = 200  # LC3 bytes per RECEIVE_MIC_DATA packet
+
+
+class MicReceiver:
+    """Reassemble the RECEIVE_MIC_DATA (0xF1) stream into ordered LC3 frames.
+
+    Packets are copied once, into a preallocated ring of `capacity` slots.
+    The 8-bit `seq` is unwrapped into a running frame index, so wrap-around,
+    duplicates, late packets and reordering within the ring are handled.
+    A missing frame is given up as lost once `reorder_depth` newer frames
+    have arrived after it.
+
+    Frames are handed out as memoryviews into the ring; a view stays valid
+    until the consumer asks for the next frame (or the ring overruns). Only
+    one consumer (async iteration or `record`) should read at a time.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 512,
+        frame_size: int = MIC_FRAME_SIZE,
+        reorder_depth: int = 8,
+    ):
+        if capacity < 2:
+            raise ValueError("Ring capacity must be at least 2 frames")
+        if not 0 <= reorder_depth < capacity:
+            raise ValueError("reorder_depth must be smaller than the ring capacity")
+        self.capacity = capacity
+        self.frame_size = frame_size
+        self.reorder_depth = reorder_depth
+        self._buffer = bytearray(capacity * frame_size)
+        self._view = memoryview(self._buffer)
+        self._lengths = [0] * capacity
+        # Frame index stored in each slot; a slot holds frame i if this is i
+        self._slot_index = [-1] * capacity
+        self._read = 0  # Next frame the consumer takes
+        self._ready = 0  # Frames before this one are in order or given up
+        self._highest = -1  # Highest frame index received
+        self._started = False
+        self._closed = False
+        self._overrunning = False
+        self._data_ready = asyncio.Event()
+        self.received = 0
+        self.delivered = 0
+        self.duplicates = 0
+        self.late = 0
+        self.reordered = 0
+        self.lost = 0
+        self.overruns = 0
+        self.truncated = 0
+
+    def __len__(self) -> int:
+        """Frames ready to read."""
+        return self._ready - self._read
+
+    def handle_event(self, event: MicDataEvent):
+        """Dispatcher handler for Command.RECEIVE_MIC_DATA."""
+        self.feed(event.data)
+
+    def feed(self, packet: Union[bytes, bytearray, memoryview]):
+        """Store one [0xF1, seq, audio...] packet."""
+        if self._closed or len(packet) < MIC_HEADER_SIZE:
+            return
+        seq = packet[1]
+        self.received += 1
+        if not self._started:
+            self._started = True
+            self._read = self._ready = seq
+            self._highest = seq - 1
+        index = self._unwrap(seq)
+
+        if index < self._ready:
+            self.late += 1
+            return
+        limit = self._read + self.capacity - 1  # Keep the slot the consumer holds
+        if index >= limit:
+            # Consumer is too far behind: give up the oldest unread frames
+            skipped = index - limit + 1
+            self.overruns += skipped
+            self._read += skipped
+            if self._ready < self._read:
+                self._ready = self._read
+            if not self._overrunning:
+                self._overrunning = True
+                logger.warning("Mic ring overrun, consumer is not keeping up")
+
+        slot = index % self.capacity
+        if self._slot_index[slot] == index:
+            self.duplicates += 1
+            return
+        audio = memoryview(packet)[MIC_HEADER_SIZE:]
+        length = len(audio)
+        if length > self.frame_size:
+            self.truncated += 1
+            length = self.frame_size
+        offset = slot * self.frame_size
+        self._view[offset : offset + length] = audio[:length]
+        self._lengths[slot] = length
+        self._slot_index[slot] = index
+        if index < self._highest:
+            self.reordered += 1
+        else:
+            self._highest = index
+        self._advance()
+
+    def _unwrap(self, seq: int) -> int:
+        # Nearest frame index to the highest one seen that has this seq
+        delta = ((seq - self._highest) + 128) % 256 - 128
+        return self._highest + delta
+
+    def _advance(self, flush: bool = False):
+        ready = self._ready
+        while ready <= self._highest:
+            if self._slot_index[ready % self.capacity] != ready:
+                if not flush and self._highest - ready < self.reorder_depth:
+                    break
+                self.lost += 1
+            ready += 1
+        if ready != self._ready:
+            self._ready = ready
+            self._data_ready.set()
+
+    def read_nowait(self) -> Optional[memoryview]:
+        """Return the next in-order frame, or None if none is ready."""
+        self._overrunning = False
+        while self._read < self._ready:
+            index = self._read
+            self._read += 1
+            slot = index % self.capacity
+            if self._slot_index[slot] == index:
+                self.delivered += 1
+                offset = slot * self.frame_size
+                return self._view[offset : offset + self._lengths[slot]]
+        return None
+
+    async def read(self) -> Optional[memoryview]:
+        """Wait for the next frame; None once the receiver is closed and drained."""
+        while True:
+            frame = self.read_nowait()
+            if frame is not None or self._closed:
+                return frame
+            self._data_ready.clear()
+            await self._data_ready.wait()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> memoryview:
+        frame = await self.read()
+        if frame is None:
+            raise StopAsyncIteration
+        return frame
+
+    async def record(self, sink: Union[str, BinaryIO]) -> int:
+        """Write frames to a file path or binary file until closed.
+
+        Returns the number of bytes written.
+        """
+        if isinstance(sink, str):
+            with open(sink, "wb") as f:
+                return await self.record(f)
+        written = 0
+        async for frame in self:
+            written += sink.write(frame)
+        sink.flush()
+        return written
+
+    def close(self):
+        """Stop accepting packets; frames still missing are counted as lost."""
+        if self._closed:
+            return
+        self._advance(flush=True)
+        self._closed = True
+        self._data_ready.set()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "received": self.received,
+            "delivered": self.delivered,
+            "buffered": len(self),
+            "duplicates": self.duplicates,
+            "late": self.late,
+            "reordered": self.reordered,
+            "lost": self.lost,
+            "overruns": self.overruns,
+            "truncated": self.truncated,
+        }
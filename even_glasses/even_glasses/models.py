@@ -1,8 +1,8 @@
 from pydantic import BaseModel, Field
-from typing import Literal
+from typing import List, Literal
 import time
 import json
-from enum import IntEnum
+from enum import Enum, IntEnum
 from datetime import datetime
 
 
@@ -47,6 +47,23 @@ class AIStatus(IntEnum):
     NETWORK_ERROR = 0x60  # Even AI network error
 
 
+class NotificationPriority(IntEnum):
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+    URGENT = 3  # Not rate limited
+
+
+class ConnectionState(str, Enum):
+    """Link state of a BleDevice, reported to its state listeners."""
+
+    DISCONNECTED = "disconnected"
+    CONNECTING = "connecting"
+    CONNECTED = "connected"
+    RECONNECTING = "reconnecting"
+    FAILED = "failed"  # Connect or every reconnect attempt failed
+
+
 class SendResult(BaseModel):
     command: int = Field(default=Command.SEND_RESULT)
     seq: int = Field(default=0)
@@ -60,20 +77,45 @@ class SendResult(BaseModel):
     data: bytes = Field(default=b"")
 
     def build(self) -> bytes:
-        header = bytes(
-            [
-                self.command,
-                self.seq,
-                self.total_packages,
-                self.current_package,
-                self.screen_status,
-                self.new_char_pos0,
-                self.new_char_pos1,
-                self.page_number,
-                self.max_pages,
-            ]
+        return self._packet().build(self.total_packages, self.current_package)
+
+    def fragment(self, max_packet_size: int) -> List[bytes]:
+        """Split data into numbered packages of at most `max_packet_size` bytes.
+
+        Splits never cut a UTF-8 character in two.
+        """
+        return self._packet().fragment(max_packet_size)
+
+    def _packet(self):
+        # encoders imports this module, so it cannot be imported at the top
+        from even_glasses.encoders import SendResultPacket
+
+        return SendResultPacket(
+            self.data,
+            page_number=self.page_number,
+            max_pages=self.max_pages,
+            screen_status=self.screen_status,
+            seq=self.seq,
+            new_char_pos0=self.new_char_pos0,
+            new_char_pos1=self.new_char_pos1,
+            command=self.command,
         )
-        return header + self.data
+
+
+def split_utf8(data: bytes, size: int) -> List[bytes]:
+    """Split UTF-8 bytes into chunks of at most `size` bytes on character boundaries."""
+    if not data:
+        return [b""]
+    chunks = []
+    start = 0
+    while start < len(data):
+        end = min(start + size, len(data))
+        # Back off while the cut lands on a continuation byte (0b10xxxxxx)
+        while end < len(data) and end > start + 1 and data[end] & 0xC0 == 0x80:
+            end -= 1
+        chunks.append(data[start:end])
+        start = end
+    return chunks
 
 
 class NCSNotification(BaseModel):
@@ -118,9 +160,9 @@ class Notification(BaseModel):
     def to_bytes(self):
         return json.dumps(self.to_json()).encode("utf-8")
 
-    async def construct_notification(self):
+    async def construct_notification(self, max_packet_size: int = 180):
         json_bytes = self.to_bytes()
-        max_chunk_size = 180 - 4  # Subtract 4 bytes for header
+        max_chunk_size = max_packet_size - 4  # Subtract 4 bytes for header
         chunks = [
             json_bytes[i : i + max_chunk_size]
             for i in range(0, len(json_bytes), max_chunk_size)
@@ -139,6 +181,29 @@ class RSVPConfig(BaseModel):
     words_per_group: int = Field(default=1)
     wpm: int = Field(default=250)
     padding_char: str = Field(default="...")
+    late_policy: Literal["merge", "skip", "none"] = Field(
+        default="merge",
+        description="What to do with frames whose slot passed while the link was busy",
+    )
+    max_merge: int = Field(default=3, description="Most groups shown together when merging")
+    prerender: bool = Field(
+        default=False,
+        description="Render frames to packets ahead of playback and write them directly",
+    )
+
+
+class RSVPStats(BaseModel):
+    target_wpm: int = Field(default=0)
+    achieved_wpm: float = Field(default=0.0)
+    words_displayed: int = Field(default=0)
+    frames_sent: int = Field(default=0)
+    frames_skipped: int = Field(default=0)
+    frames_merged: int = Field(default=0)
+    elapsed: float = Field(default=0.0, description="Seconds from first word to last")
+    mean_jitter: float = Field(default=0.0, description="Mean seconds off the frame deadline")
+    max_jitter: float = Field(default=0.0)
+    jitter_stddev: float = Field(default=0.0)
+    completed: bool = Field(default=False)
 
 
 class BleReceive(BaseModel):
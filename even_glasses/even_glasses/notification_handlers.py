@@ -1,5 +1,8 @@
 import logging
 
+from even_glasses.dispatcher import AIEvent
+from even_glasses.models import SubCommand
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,4 +17,17 @@ async def handle_incoming_notification(sender: int, data: bytes):
     message = data.decode('utf-8', errors='ignore')
     logger.info(f"Notification received from {sender}: {message}")
     # Implement your processing logic here
-    # For example, parse the message and trigger events or update states
\ No newline at end of file
+    # For example, parse the message and trigger events or update states
+
+
+def handle_ai_event(event: AIEvent):
+    """
+    Log START_AI events (touchpad actions) from either glass.
+
+    Subscribe with `manager.subscribe(Command.START_AI, handle_ai_event)`.
+    """
+    try:
+        action = SubCommand(event.subcommand).name
+    except ValueError:
+        action = f"0x{event.subcommand:02X}" if event.subcommand is not None else "?"
+    logger.info(f"AI event from {event.source.name}: {action}")
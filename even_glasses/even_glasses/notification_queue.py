@@ -0,0 +1,246 @@
+import asyncio
+import heapq
+import logging
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from even_glasses.commands import send_notification
+from even_glasses.models import NCSNotification, NotificationPriority
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_ID = "summary"  # msg_id slot of an app's collapsed summary entry
+
+
+class _Entry:
+    __slots__ = ("key", "notification", "priority", "seq", "version", "merged")
+
+    def __init__(self, key, notification, priority, seq):
+        self.key = key
+        self.notification = notification
+        self.priority = priority
+        self.seq = seq
+        self.version = 0  # Id of the heap item that is current for this entry
+        self.merged = 1  # Notifications this entry stands for
+
+
+class _TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class NotificationQueue:
+    """Prioritized, deduplicating notification sender for a GlassesManager.
+
+    - A notification with the same (app_identifier, msg_id) as one still
+      queued replaces it in place.
+    - Higher NotificationPriority classes are sent first, FIFO within a class.
+    - Each app may send `app_rate` notifications per second with bursts of
+      `app_burst`; URGENT notifications bypass the limit.
+    - When more than `summary_threshold` notifications from one app are
+      waiting, they collapse into a single summary.
+    - At most `max_size` entries are queued; the lowest priority, oldest
+      entry is dropped first.
+    """
+
+    def __init__(
+        self,
+        manager,
+        app_rate: float = 0.5,
+        app_burst: int = 3,
+        summary_threshold: int = 3,
+        max_size: int = 64,
+    ):
+        self.manager = manager
+        self.app_rate = app_rate
+        self.app_burst = app_burst
+        self.summary_threshold = summary_threshold
+        self.max_size = max_size
+        self._entries: Dict[Tuple[str, object], _Entry] = {}
+        self._by_app: Dict[str, Set[Tuple[str, object]]] = {}
+        self._heap: List[tuple] = []
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._seq = 0
+        self._pushes = 0
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._worker: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.replaced = 0
+        self.summarized = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(
+        self,
+        notification: NCSNotification,
+        priority: NotificationPriority = NotificationPriority.NORMAL,
+    ):
+        """Queue a notification and start the sender if it is not running."""
+        app = notification.app_identifier
+        key = (app, notification.msg_id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            # Keep the queue position, take the newer content
+            entry.notification = notification
+            self.replaced += 1
+            if priority > entry.priority:
+                entry.priority = priority
+                self._push(entry)
+        else:
+            self._seq += 1
+            entry = _Entry(key, notification, priority, self._seq)
+            self._entries[key] = entry
+            self._by_app.setdefault(app, set()).add(key)
+            self._push(entry)
+            # Fold into a queued summary, or start one once the app bursts
+            if (
+                len(self._by_app[app]) > self.summary_threshold
+                or (app, SUMMARY_ID) in self._entries
+            ):
+                self._summarize(app)
+            if len(self._entries) > self.max_size:
+                self._drop_one()
+
+        self._idle.clear()
+        self._wakeup.set()
+        self.start()
+
+    def start(self):
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+    async def join(self):
+        """Wait until every queued notification has been sent or dropped."""
+        await self._idle.wait()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": len(self._entries),
+            "sent": self.sent,
+            "replaced": self.replaced,
+            "summarized": self.summarized,
+            "dropped": self.dropped,
+        }
+
+    def _push(self, entry: _Entry):
+        # Heap items are (priority, arrival, push id, entry); the unique push id
+        # keeps tuples from ever comparing entries and marks stale items
+        self._pushes += 1
+        entry.version = self._pushes
+        heapq.heappush(self._heap, (-entry.priority, entry.seq, self._pushes, entry))
+
+    def _remove(self, entry: _Entry):
+        del self._entries[entry.key]
+        app_keys = self._by_app[entry.key[0]]
+        app_keys.discard(entry.key)
+        if not app_keys:
+            del self._by_app[entry.key[0]]
+
+    def _summarize(self, app: str):
+        entries = sorted(
+            (self._entries[key] for key in self._by_app[app]), key=lambda e: e.seq
+        )
+        latest = entries[-1].notification
+        count = sum(entry.merged for entry in entries)
+        for entry in entries:
+            self._remove(entry)
+        summary = latest.model_copy(
+            update={
+                "title": latest.display_name,
+                "subtitle": f"{count} new notifications",
+                "message": f"{latest.title}: {latest.message}",
+            }
+        )
+        key = (app, SUMMARY_ID)
+        entry = _Entry(key, summary, max(e.priority for e in entries), entries[0].seq)
+        entry.merged = count
+        self._entries[key] = entry
+        self._by_app.setdefault(app, set()).add(key)
+        self._push(entry)
+        self.summarized += sum(e.merged for e in entries if e.key[1] != SUMMARY_ID)
+
+    def _drop_one(self):
+        victim = min(self._entries.values(), key=lambda e: (e.priority, e.seq))
+        self._remove(victim)
+        self.dropped += victim.merged
+        logger.warning(f"Notification queue full, dropped {victim.key}")
+
+    def _bucket(self, app: str, now: float) -> _TokenBucket:
+        bucket = self._buckets.get(app)
+        if bucket is None:
+            bucket = self._buckets[app] = _TokenBucket(self.app_rate, self.app_burst, now)
+        else:
+            bucket.refill(now)
+        return bucket
+
+    def _next_ready(self) -> Tuple[Optional[_Entry], Optional[float]]:
+        """Pop the best sendable entry, or return how long until one is."""
+        now = time.monotonic()
+        deferred = []
+        wait = None
+        ready = None
+        while self._heap:
+            item = heapq.heappop(self._heap)
+            entry = item[3]
+            if entry.version != item[2] or self._entries.get(entry.key) is not entry:
+                continue  # Superseded or already removed
+            if entry.priority < NotificationPriority.URGENT:
+                bucket = self._bucket(entry.key[0], now)
+                delay = bucket.wait_time()
+                if delay > 0:
+                    deferred.append(item)
+                    wait = delay if wait is None else min(wait, delay)
+                    continue
+                bucket.tokens -= 1
+            ready = entry
+            break
+        for item in deferred:
+            heapq.heappush(self._heap, item)
+        if ready is not None:
+            self._remove(ready)
+        return ready, wait
+
+    async def _run(self):
+        while True:
+            entry, wait = self._next_ready()
+            if entry is None:
+                if not self._entries:
+                    self._idle.set()
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                if await send_notification(self.manager, entry.notification):
+                    self.sent += entry.merged
+                else:
+                    logger.warning(f"Failed to send notification {entry.key}")
+            except Exception as e:
+                logger.error(f"Error sending notification {entry.key}: {e}")
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+
+
+class CompiledText:
+    """Ready-to-send frames for one text message.
+
+    `pages` holds the packets of every page in display order; `final` holds the
+    packets that mark the last page as complete.
+    """
+
+    __slots__ = ("pages", "final", "nbytes")
+
+    def __init__(self, pages: List[List[bytes]], final: List[bytes]):
+        self.pages = pages
+        self.final = final
+        self.nbytes = sum(len(p) for page in pages for p in page) + sum(
+            len(p) for p in final
+        )
+
+
+class PageCache:
+    """LRU cache of compiled text, bounded by entry count and total bytes."""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 1 << 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CompiledText]" = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[CompiledText]:
+        compiled = self._entries.get(key)
+        if compiled is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return compiled
+
+    def put(self, key: Hashable, compiled: CompiledText):
+        if compiled.nbytes > self.max_bytes:
+            return  # Would evict everything else; not worth caching
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.nbytes -= previous.nbytes
+        self._entries[key] = compiled
+        self.nbytes += compiled.nbytes
+        while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+        }
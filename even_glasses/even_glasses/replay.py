@@ -0,0 +1,137 @@
+"""Replay a protocol capture against the simulator.
+
+Captures recorded with `GlassesManager.start_capture()` become repeatable
+workloads for the send pipeline:
+
+    python -m even_glasses.replay info session.egcap
+    python -m even_glasses.replay dump session.egcap
+    python -m even_glasses.replay run session.egcap [--speed 10 | --fast]
+"""
+import argparse
+import asyncio
+from typing import Dict, List, Optional
+
+from even_glasses.bluetooth_manager import BleDevice
+from even_glasses.capture import KIND_OUT, capture_info, read_capture
+from even_glasses.metrics import MetricsRegistry
+from even_glasses.models import Command
+from even_glasses.simulator import SimulatedGlassesPair, SimulatorConfig
+
+# Inbound frames the glasses send on their own; replies are left to the simulator
+UNSOLICITED = (Command.START_AI, Command.RECEIVE_MIC_DATA)
+
+
+def _side(name: str) -> str:
+    upper = name.upper()
+    return "right" if "_R_" in upper or "RIGHT" in upper else "left"
+
+
+async def replay(
+    path: str,
+    speed: float = 1.0,
+    config: Optional[SimulatorConfig] = None,
+    inject_inbound: bool = True,
+    registry: Optional[MetricsRegistry] = None,
+) -> dict:
+    """Play a capture back against a simulated pair and measure the send path.
+
+    Outbound frames are handed to `BleDevice.send` at their captured offset
+    divided by `speed`; a speed of 0 sends them as fast as the pipeline
+    accepts. Device-initiated inbound frames (AI events, mic data) are pushed
+    from the simulated arm when `inject_inbound` is set; replies come from
+    the simulator itself. Returns a summary with write latency quantiles.
+    """
+    frames = [
+        frame
+        for frame in read_capture(path)
+        if frame.kind == KIND_OUT or (inject_inbound and frame.data and frame.data[0] in UNSOLICITED)
+    ]
+    registry = registry or MetricsRegistry()
+    pair = SimulatedGlassesPair(config=config)
+    simulated = {"left": pair.left, "right": pair.right}
+    devices: Dict[str, BleDevice] = {}
+    for side, glass in simulated.items():
+        devices[side] = BleDevice(
+            glass.name, glass.address, client_factory=pair.client_factory, metrics_registry=registry
+        )
+    await asyncio.gather(*(device.connect() for device in devices.values()))
+
+    sends: List[asyncio.Task] = []
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    try:
+        for frame in frames:
+            if speed > 0:
+                delay = started + frame.time / speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            side = _side(frame.device)
+            if frame.kind == KIND_OUT:
+                sends.append(asyncio.create_task(devices[side].send(frame.data)))
+            else:
+                simulated[side].notify(frame.data)
+        results = await asyncio.gather(*sends)
+        elapsed = loop.time() - started
+    finally:
+        await asyncio.gather(*(device.disconnect() for device in devices.values()))
+
+    sent = sum(results)
+    summary = {
+        "frames": len(sends),
+        "sent": sent,
+        "failed": len(sends) - sent,
+        "injected": len(frames) - len(sends),
+        "elapsed": elapsed,
+        "captured_duration": frames[-1].time if frames else 0.0,
+        "frames_per_s": sent / elapsed if elapsed > 0 else 0.0,
+    }
+    for side, glass in simulated.items():
+        write_latency = registry.histogram("even_glasses_write_seconds", device=glass.name)
+        lock_wait = registry.histogram("even_glasses_write_lock_wait_seconds", device=glass.name)
+        summary[f"{side}_write_p50"] = write_latency.quantile(0.5)
+        summary[f"{side}_write_p99"] = write_latency.quantile(0.99)
+        summary[f"{side}_lock_wait_p99"] = lock_wait.quantile(0.99)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or replay an even_glasses capture")
+    sub = parser.add_subparsers(dest="action", required=True)
+    info_parser = sub.add_parser("info", help="Summarise a capture")
+    info_parser.add_argument("path")
+    dump_parser = sub.add_parser("dump", help="Print every frame")
+    dump_parser.add_argument("path")
+    replay_parser = sub.add_parser("run", help="Replay against the simulator")
+    replay_parser.add_argument("path")
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="Playback speed factor")
+    replay_parser.add_argument("--fast", action="store_true", help="Send as fast as possible")
+    replay_parser.add_argument("--latency", type=float, default=0.01, help="Simulated write latency")
+    replay_parser.add_argument(
+        "--no-inbound", action="store_true", help="Do not inject device-initiated frames"
+    )
+    args = parser.parse_args()
+
+    if args.action == "info":
+        summary = capture_info(args.path)
+        print(f"{args.path}: {summary['out']} out, {summary['in']} in, "
+              f"{summary['bytes']} bytes over {summary['duration']:.3f} s")
+        for device, commands in summary["devices"].items():
+            print(f"  {device}")
+            for label, count in sorted(commands.items()):
+                print(f"    {label:<28} {count}")
+    elif args.action == "dump":
+        for frame in read_capture(args.path):
+            arrow = "->" if frame.kind == KIND_OUT else "<-"
+            print(f"{frame.time:12.6f} {arrow} {frame.device}: {frame.data.hex()}")
+    else:
+        config = SimulatorConfig(latency=args.latency)
+        speed = 0.0 if args.fast else args.speed
+        result = asyncio.run(
+            replay(args.path, speed=speed, config=config, inject_inbound=not args.no_inbound)
+        )
+        for key, value in result.items():
+            print(f"{key:<18} {value}")
+
+
+if __name__ == "__main__":
+    main()
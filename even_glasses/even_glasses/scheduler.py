@@ -0,0 +1,76 @@
+import asyncio
+import math
+import time
+from typing import Callable
+
+
+class FrameScheduler:
+    """Paces frames against absolute deadlines on the monotonic clock.
+
+    Frame `i` is due at `start + i * interval`, so time spent sending a frame
+    never pushes later frames back. The expected send time is learned from
+    completed sends and subtracted from the wait, so a frame finishes
+    sending as close to its deadline as the link allows.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        clock: Callable[[], float] = time.monotonic,
+        smoothing: float = 0.2,
+    ):
+        self.interval = interval
+        self.clock = clock
+        self.smoothing = smoothing
+        self.send_estimate = 0.0
+        self.start_time = 0.0
+        self.frames = 0
+        self._jitter_sum = 0.0
+        self._jitter_sq_sum = 0.0
+        self.max_jitter = 0.0
+
+    def start(self):
+        self.start_time = self.clock()
+
+    def delay_by(self, seconds: float):
+        """Push every remaining deadline back, e.g. while input is stalled."""
+        self.start_time += seconds
+
+    def deadline(self, index: int) -> float:
+        return self.start_time + index * self.interval
+
+    def frames_behind(self, index: int) -> int:
+        """Number of whole frame slots already missed before frame `index`."""
+        late = self.clock() + self.send_estimate - self.deadline(index)
+        return max(0, int(late // self.interval))
+
+    async def wait(self, index: int):
+        """Sleep until it is time to start sending frame `index`."""
+        delay = self.deadline(index) - self.send_estimate - self.clock()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record(self, index: int, send_started: float):
+        """Record that frame `index` finished sending now."""
+        now = self.clock()
+        self.send_estimate += self.smoothing * (now - send_started - self.send_estimate)
+        jitter = abs(now - self.deadline(index))
+        self.frames += 1
+        self._jitter_sum += jitter
+        self._jitter_sq_sum += jitter * jitter
+        self.max_jitter = max(self.max_jitter, jitter)
+
+    @property
+    def elapsed(self) -> float:
+        return self.clock() - self.start_time
+
+    @property
+    def mean_jitter(self) -> float:
+        return self._jitter_sum / self.frames if self.frames else 0.0
+
+    @property
+    def jitter_stddev(self) -> float:
+        if not self.frames:
+            return 0.0
+        mean = self.mean_jitter
+        return math.sqrt(max(0.0, self._jitter_sq_sum / self.frames - mean * mean))
@@ -0,0 +1,430 @@
+import asyncio
+import random
+import struct
+from typing import Callable, Dict, List, Optional
+
+from bleak.exc import BleakError
+from pydantic import BaseModel, Field
+
+from even_glasses.models import Command, ResponseStatus
+from even_glasses.service_identifiers import (
+    UART_SERVICE_UUID,
+    UART_TX_CHAR_UUID,
+    UART_RX_CHAR_UUID,
+)
+
+
+class SimulatorConfig(BaseModel):
+    """Link and firmware behaviour of a simulated G1 arm."""
+
+    latency: float = Field(default=0.01, description="Seconds per confirmed write")
+    jitter: float = Field(default=0.0, description="Max random extra seconds per write")
+    no_response_latency: float = Field(
+        default=0.001, description="Seconds per write-without-response"
+    )
+    ack_delay: float = Field(default=0.0, description="Seconds before a reply is notified")
+    mtu: int = Field(default=247, description="ATT MTU reported after connect")
+    packet_loss: float = Field(default=0.0, description="Probability a write is dropped")
+    disconnect_after: Optional[int] = Field(
+        default=None, description="Drop the link after this many writes"
+    )
+    disconnect_probability: float = Field(
+        default=0.0, description="Probability the link drops on any write"
+    )
+    connect_delay: float = Field(default=0.05, description="Seconds to establish a link")
+    advertise_delay: float = Field(default=0.1, description="Seconds until first advert")
+    advertise_interval: float = Field(default=0.1, description="Seconds between adverts")
+    record: bool = Field(default=True, description="Keep every received frame")
+    mic_interval: float = Field(default=0.02, description="Seconds between mic packets")
+    mic_frame_size: int = Field(default=200, description="Audio bytes per mic packet")
+    mic_loss: float = Field(default=0.0, description="Probability a mic packet is lost")
+    mic_reorder: float = Field(
+        default=0.0, description="Probability a mic packet is swapped with the next"
+    )
+    seed: Optional[int] = Field(default=None, description="Random seed for reproducibility")
+
+
+class SimulatedCharacteristic:
+    """Minimal stand-in for a BleakGATTCharacteristic."""
+
+    def __init__(self, uuid: str, handle: int):
+        self.uuid = uuid.lower()
+        self.handle = handle
+
+    def __repr__(self):
+        return f"SimulatedCharacteristic({self.uuid}, handle={self.handle})"
+
+
+class SimulatedService:
+    """Minimal stand-in for a BleakGATTService."""
+
+    def __init__(self, uuid: str, characteristics: List[SimulatedCharacteristic]):
+        self.uuid = uuid.lower()
+        self.characteristics = characteristics
+
+    def get_characteristic(self, uuid: str) -> Optional[SimulatedCharacteristic]:
+        for char in self.characteristics:
+            if char.uuid == uuid.lower():
+                return char
+        return None
+
+
+class SimulatedServiceCollection:
+    """Minimal stand-in for a BleakGATTServiceCollection."""
+
+    def __init__(self, services: List[SimulatedService]):
+        self._services = {service.uuid: service for service in services}
+
+    def get_service(self, uuid: str) -> Optional[SimulatedService]:
+        return self._services.get(uuid.lower())
+
+
+class SimulatedAdvertisement:
+    """Scan result carrying the fields GlassesManager reads from a BLEDevice.
+
+    Also passed as the AdvertisementData argument of detection callbacks.
+    """
+
+    def __init__(self, name: str, address: str, rssi: int = -60):
+        self.name = name
+        self.local_name = name
+        self.address = address
+        self.rssi = rssi
+
+    def __repr__(self):
+        return f"SimulatedAdvertisement({self.name}, {self.address})"
+
+
+class SimulatedGlass:
+    """Firmware model of one G1 arm: answers writes and pushes notifications."""
+
+    def __init__(self, name: str, address: str, side: str, config: SimulatorConfig):
+        self.name = name
+        self.address = address
+        self.side = side
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.tx_char = SimulatedCharacteristic(UART_TX_CHAR_UUID, 0x0E)
+        self.rx_char = SimulatedCharacteristic(UART_RX_CHAR_UUID, 0x10)
+        self.services = SimulatedServiceCollection(
+            [SimulatedService(UART_SERVICE_UUID, [self.tx_char, self.rx_char])]
+        )
+        self.client: Optional["SimulatedClient"] = None
+        self.frames: List[bytes] = []
+        self.writes = 0
+        self.bytes_received = 0
+        self.dropped = 0
+        self.disconnects = 0
+        self.mic_sent = 0  # Mic packets generated, including lost ones
+        self._mic_held: Optional[bytes] = None
+        self._mic_task: Optional[asyncio.Task] = None
+
+    def respond(self, data: bytes) -> Optional[bytes]:
+        """Return the reply the firmware sends for an incoming frame, if any."""
+        command = data[0]
+        if command == Command.HEARTBEAT:
+            return bytes(data)
+        if command == Command.OPEN_MIC:
+            enable = data[1] if len(data) > 1 else 0
+            return bytes([Command.MIC_RESPONSE, ResponseStatus.SUCCESS, enable])
+        return bytes([command, ResponseStatus.SUCCESS])
+
+    def notify(self, data: bytes):
+        """Push a notification to the connected client, if notifications are on."""
+        if self.client is not None:
+            self.client._deliver(self.rx_char, data)
+
+    def mic_packet(self, index: int) -> bytes:
+        """Mic packet number `index`; the audio starts with the index for checking."""
+        audio = struct.pack(">I", index).ljust(self.config.mic_frame_size, b"\x00")
+        return bytes([Command.RECEIVE_MIC_DATA, index & 0xFF]) + audio
+
+    def push_mic(self, count: int = 1):
+        """Generate `count` mic packets now, applying mic loss and reordering."""
+        config = self.config
+        for _ in range(count):
+            packet = self.mic_packet(self.mic_sent)
+            self.mic_sent += 1
+            if self.rng.random() < config.mic_loss:
+                continue
+            if self._mic_held is not None:
+                self.notify(packet)
+                self.notify(self._mic_held)
+                self._mic_held = None
+            elif self.rng.random() < config.mic_reorder:
+                self._mic_held = packet
+            else:
+                self.notify(packet)
+
+    def _set_mic(self, enable: bool):
+        if enable and (self._mic_task is None or self._mic_task.done()):
+            self._mic_task = asyncio.get_running_loop().create_task(self._stream_mic())
+        elif not enable and self._mic_task is not None:
+            self._mic_task.cancel()
+            self._mic_task = None
+
+    async def _stream_mic(self):
+        while self.client is not None:
+            self.push_mic()
+            await asyncio.sleep(self.config.mic_interval)
+
+    def drop_link(self):
+        """Simulate the arm going out of range."""
+        if self.client is not None:
+            self.disconnects += 1
+            self.client._drop()
+
+    def _receive(self, data: bytes):
+        self.writes += 1
+        self.bytes_received += len(data)
+        if self.config.record:
+            self.frames.append(bytes(data))
+        if data[0] == Command.OPEN_MIC and self.side == "right":
+            self._set_mic(len(data) > 1 and data[1] == 1)
+        reply = self.respond(data)
+        if reply is not None:
+            loop = asyncio.get_running_loop()
+            loop.call_later(self.config.ack_delay, self.notify, reply)
+
+
+class SimulatedClient:
+    """In-process drop-in for BleakClient talking to a SimulatedGlass."""
+
+    def __init__(
+        self,
+        device: SimulatedGlass,
+        disconnected_callback: Optional[Callable[["SimulatedClient"], None]] = None,
+        **kwargs,
+    ):
+        self.device = device
+        self.address = device.address
+        self.name = device.name
+        self._disconnected_callback = disconnected_callback
+        self._connected = False
+        self._notify_callbacks: Dict[int, Callable] = {}
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    @property
+    def services(self) -> SimulatedServiceCollection:
+        return self.device.services
+
+    @property
+    def mtu_size(self) -> int:
+        return self.device.config.mtu
+
+    async def connect(self, **kwargs) -> bool:
+        await asyncio.sleep(self.device.config.connect_delay)
+        if self.device.client is not None and self.device.client is not self:
+            raise BleakError(f"{self.device.name} is already connected")
+        self.device.client = self
+        self._connected = True
+        return True
+
+    async def disconnect(self) -> bool:
+        self._teardown()
+        return True
+
+    async def get_services(self, **kwargs) -> SimulatedServiceCollection:
+        return self.services
+
+    async def start_notify(self, char_specifier, callback: Callable, **kwargs):
+        self._notify_callbacks[self._handle(char_specifier)] = callback
+
+    async def stop_notify(self, char_specifier):
+        self._notify_callbacks.pop(self._handle(char_specifier), None)
+
+    async def write_gatt_char(self, char_specifier, data, response: bool = False):
+        if not self._connected:
+            raise BleakError(f"{self.device.name} is not connected")
+        if self._handle(char_specifier) != self.device.tx_char.handle:
+            raise BleakError(f"Characteristic {char_specifier} is not writable")
+        config = self.device.config
+        if len(data) > config.mtu - 3:
+            raise BleakError(
+                f"Write of {len(data)} bytes exceeds MTU payload {config.mtu - 3}"
+            )
+
+        rng = self.device.rng
+        delay = config.latency if response else config.no_response_latency
+        if config.jitter:
+            delay += rng.uniform(0, config.jitter)
+        await asyncio.sleep(delay)
+
+        if rng.random() < config.packet_loss:
+            self.device.dropped += 1
+        else:
+            self.device._receive(bytes(data))
+
+        if (
+            config.disconnect_after is not None
+            and self.device.writes >= config.disconnect_after
+        ) or rng.random() < config.disconnect_probability:
+            self.device.drop_link()
+            raise BleakError(f"{self.device.name} disconnected during write")
+
+    def _handle(self, char_specifier) -> int:
+        if isinstance(char_specifier, SimulatedCharacteristic):
+            return char_specifier.handle
+        if isinstance(char_specifier, int):
+            return char_specifier
+        for char in (self.device.tx_char, self.device.rx_char):
+            if char.uuid == str(char_specifier).lower():
+                return char.handle
+        raise BleakError(f"Characteristic {char_specifier} not found")
+
+    def _deliver(self, char: SimulatedCharacteristic, data: bytes):
+        callback = self._notify_callbacks.get(char.handle)
+        if callback is None or not self._connected:
+            return
+        result = callback(char, bytearray(data))
+        if asyncio.iscoroutine(result):
+            asyncio.ensure_future(result)
+
+    def _teardown(self):
+        self._connected = False
+        self._notify_callbacks.clear()
+        if self.device.client is self:
+            self.device.client = None
+
+    def _drop(self):
+        was_connected = self._connected
+        self._teardown()
+        if was_connected and self._disconnected_callback:
+            self._disconnected_callback(self)
+
+
+class SimulatedScanner:
+    """Drop-in for BleakScanner that discovers registered simulated arms.
+
+    Supports both `await scanner.discover()` and, like the BleakScanner
+    class, `scanner(detection_callback=...)` followed by start()/stop().
+    Each arm is detected after its config's advertise_delay, then again
+    every advertise_interval while it is not connected.
+    """
+
+    def __init__(
+        self,
+        devices: List[SimulatedGlass],
+        detection_callback: Optional[Callable] = None,
+    ):
+        self.devices = devices
+        self.detection_callback = detection_callback
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+
+    def __call__(self, detection_callback: Optional[Callable] = None, **kwargs) -> "SimulatedScanner":
+        return SimulatedScanner(self.devices, detection_callback)
+
+    async def discover(self, timeout: float = 10, **kwargs) -> List[SimulatedAdvertisement]:
+        delay = max((d.config.advertise_delay for d in self.devices), default=0)
+        await asyncio.sleep(min(delay, timeout))
+        return [SimulatedAdvertisement(d.name, d.address) for d in self.devices]
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        for device in self.devices:
+            self._timers[device.address] = loop.call_later(
+                device.config.advertise_delay, self._detect, device
+            )
+
+    async def stop(self):
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+
+    def _detect(self, device: SimulatedGlass):
+        if device.client is None and self.detection_callback:
+            advertisement = SimulatedAdvertisement(device.name, device.address)
+            self.detection_callback(advertisement, advertisement)
+        self._timers[device.address] = asyncio.get_running_loop().call_later(
+            device.config.advertise_interval, self._detect, device
+        )
+
+
+class SimulatedGlassesPair:
+    """A simulated left/right G1 pair that can be injected into GlassesManager.
+
+    Example:
+        pair = SimulatedGlassesPair(config=SimulatorConfig(latency=0.02))
+        manager = GlassesManager(client_factory=pair.client_factory, scanner=pair.scanner)
+        await manager.scan_and_connect()
+    """
+
+    def __init__(
+        self,
+        serial: int = 1,
+        config: Optional[SimulatorConfig] = None,
+        left_config: Optional[SimulatorConfig] = None,
+        right_config: Optional[SimulatorConfig] = None,
+    ):
+        config = config or SimulatorConfig()
+        self.serial = serial
+        self.left = SimulatedGlass(
+            name=f"Even G1_{serial}_L_SIM{serial:04d}",
+            address=f"SIM:{serial:04d}:L",
+            side="left",
+            config=left_config or config,
+        )
+        self.right = SimulatedGlass(
+            name=f"Even G1_{serial}_R_SIM{serial:04d}",
+            address=f"SIM:{serial:04d}:R",
+            side="right",
+            config=right_config or config,
+        )
+        self.scanner = SimulatedScanner([self.left, self.right])
+
+    @property
+    def devices(self) -> List[SimulatedGlass]:
+        return [self.left, self.right]
+
+    def client_factory(self, address, disconnected_callback=None, **kwargs) -> SimulatedClient:
+        """Build a SimulatedClient with the same call signature as BleakClient."""
+        address = getattr(address, "address", address)
+        for device in self.devices:
+            if device.address == address:
+                return SimulatedClient(device, disconnected_callback=disconnected_callback)
+        raise BleakError(f"Device with address {address} was not found")
+
+
+class SimulatedFleet:
+    """Several simulated pairs behind one scanner, for GlassesFleet.
+
+    Example:
+        sim = SimulatedFleet(count=12, config=SimulatorConfig(latency=0.02))
+        fleet = GlassesFleet(client_factory=sim.client_factory, scanner=sim.scanner)
+        await fleet.scan_and_connect(expected_pairs=12)
+    """
+
+    def __init__(
+        self,
+        count: int = 0,
+        config: Optional[SimulatorConfig] = None,
+        first_serial: int = 1,
+        serials: Optional[List[int]] = None,
+    ):
+        if serials is None:
+            serials = range(first_serial, first_serial + count)
+        self.pairs = [SimulatedGlassesPair(serial=serial, config=config) for serial in serials]
+        self.scanner = SimulatedScanner(self.devices)
+
+    @property
+    def devices(self) -> List[SimulatedGlass]:
+        return [device for pair in self.pairs for device in pair.devices]
+
+    def client_factory(self, address, disconnected_callback=None, **kwargs) -> SimulatedClient:
+        address = getattr(address, "address", address)
+        for device in self.devices:
+            if device.address == address:
+                return SimulatedClient(device, disconnected_callback=disconnected_callback)
+        raise BleakError(f"Device with address {address} was not found")
+
+
+def simulated_backend(serials: List[str]):
+    """WorkerPool backend that simulates the pairs a worker is given.
+
+    Returns (client_factory, scanner) for a SimulatedFleet of `serials`.
+    """
+    fleet = SimulatedFleet(serials=[int(serial) for serial in serials])
+    return fleet.client_factory, fleet.scanner
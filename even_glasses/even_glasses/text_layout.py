@@ -0,0 +1,142 @@
+import unicodedata
+from typing import Dict, Iterator, List, Optional
+
+# Usable width of the Even AI text area, from the G1 protocol notes
+DISPLAY_WIDTH = 488
+
+# The widths below are estimates by glyph class, not measured from the
+# firmware font, so lines are packed this many pixels short of the display
+# width. That absorbs the estimation error and keeps the firmware from
+# re-wrapping a line on its own.
+WRAP_MARGIN = 24
+
+# Estimated advance widths in pixels of the G1 system font. Characters that
+# are not listed fall back to DEFAULT_GLYPH_WIDTH, or WIDE_GLYPH_WIDTH for
+# East Asian wide characters.
+DEFAULT_GLYPH_WIDTH = 12
+WIDE_GLYPH_WIDTH = 22
+GLYPH_WIDTHS: Dict[str, int] = {
+    " ": 6,
+    **dict.fromkeys("il.,:;!|'`", 5),
+    **dict.fromkeys("Ijft()[]{}\"", 7),
+    **dict.fromkeys("r-/\\*", 8),
+    **dict.fromkeys("sczJ?", 10),
+    **dict.fromkeys("abdeghknopquvxy0123456789$_^~<>=+", 11),
+    **dict.fromkeys("ABCDEFGHKLNOPQRSTUVXYZ#&", 13),
+    **dict.fromkeys("mw%@", 16),
+    **dict.fromkeys("MW", 17),
+}
+
+
+class TextLayout:
+    """Greedy line breaker that wraps text by glyph width instead of characters.
+
+    Word widths are memoized, so re-laying out similar text mostly costs a
+    dictionary lookup per word.
+    """
+
+    def __init__(
+        self,
+        max_width: int = DISPLAY_WIDTH - WRAP_MARGIN,
+        glyph_widths: Optional[Dict[str, int]] = None,
+        default_width: int = DEFAULT_GLYPH_WIDTH,
+        wide_width: int = WIDE_GLYPH_WIDTH,
+        cache_size: int = 8192,
+    ):
+        self.max_width = max_width
+        self.glyph_widths = dict(GLYPH_WIDTHS if glyph_widths is None else glyph_widths)
+        self.default_width = default_width
+        self.wide_width = wide_width
+        self.cache_size = cache_size
+        self.space_width = self.char_width(" ")
+        # Flat table for the ASCII fast path
+        self._ascii_widths = [self.char_width(chr(i)) for i in range(128)]
+        # No line can hold more characters than this
+        narrowest = min(self.glyph_widths.values(), default=default_width)
+        narrowest = min(narrowest, default_width)
+        self._max_chars = max_width // max(narrowest, 1)
+        self._word_widths: Dict[str, int] = {}
+
+    def char_width(self, char: str) -> int:
+        width = self.glyph_widths.get(char)
+        if width is not None:
+            return width
+        if unicodedata.east_asian_width(char) in ("W", "F"):
+            return self.wide_width
+        return self.default_width
+
+    def text_width(self, text: str) -> int:
+        if text.isascii():
+            table = self._ascii_widths
+            return sum([table[b] for b in text.encode("ascii")])
+        return sum([self.char_width(c) for c in text])
+
+    def word_width(self, word: str) -> int:
+        width = self._word_widths.get(word)
+        if width is None:
+            if len(self._word_widths) >= self.cache_size:
+                self._word_widths.clear()
+            width = self._word_widths[word] = self.text_width(word)
+        return width
+
+    def wrap(self, text: str) -> List[str]:
+        """Wrap text into lines no wider than max_width."""
+        return list(self.iter_lines(text))
+
+    def iter_lines(self, text: str) -> Iterator[str]:
+        """Lazily yield wrapped lines, one paragraph at a time.
+
+        Runs of spaces and tabs collapse to a single space on every line.
+        """
+        for paragraph in text.split("\n"):
+            words = paragraph.split()
+            if not words:
+                continue
+            paragraph = " ".join(words)
+            # Fast path: paragraphs that fit need no word splitting
+            if (
+                len(paragraph) <= self._max_chars
+                and self.text_width(paragraph) <= self.max_width
+            ):
+                yield paragraph
+                continue
+            yield from self._wrap_words(words)
+
+    def _wrap_words(self, words: List[str]) -> Iterator[str]:
+        max_width = self.max_width
+        space = self.space_width
+        line: List[str] = []
+        width = 0
+        for word in words:
+            word_width = self.word_width(word)
+            if word_width > max_width:
+                if line:
+                    yield " ".join(line)
+                # Hard-break words that are wider than a whole line
+                pieces = list(self._split_word(word))
+                yield from pieces[:-1]
+                line, width = [pieces[-1]], self.text_width(pieces[-1])
+                continue
+            needed = word_width if not line else width + space + word_width
+            if needed > max_width:
+                yield " ".join(line)
+                line, width = [word], word_width
+            else:
+                line.append(word)
+                width = needed
+        if line:
+            yield " ".join(line)
+
+    def _split_word(self, word: str) -> Iterator[str]:
+        start = 0
+        width = 0
+        for index, char in enumerate(word):
+            char_width = self.char_width(char)
+            if width + char_width > self.max_width and index > start:
+                yield word[start:index]
+                start, width = index, 0
+            width += char_width
+        yield word[start:]
+
+
+default_layout = TextLayout()
@@ -0,0 +1,63 @@
+import asyncio
+import codecs
+import re
+from typing import IO, AsyncIterable, AsyncIterator, Union
+
+_WORD = re.compile(r"\S+")
+
+TextSource = Union[str, IO, AsyncIterable]
+
+
+async def iter_words(source: TextSource, chunk_size: int = 4096) -> AsyncIterator[str]:
+    """Yield whitespace-separated words from a text source as they arrive.
+
+    `source` may be a str, an object with a sync or async `read(n)` method
+    (open files, asyncio.StreamReader), or an async iterable of str/bytes
+    chunks such as a live transcription feed. Only one chunk and one partial
+    word are held in memory at a time.
+    """
+    if isinstance(source, str):
+        for match in _WORD.finditer(source):
+            yield match.group()
+        return
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    tail = ""
+    async for chunk in _iter_chunks(source, chunk_size):
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = decoder.decode(bytes(chunk))
+        if not chunk:
+            continue
+        text = tail + chunk
+        words = text.split()
+        # A word touching the end of the chunk may continue in the next one
+        if words and not text[-1].isspace():
+            tail = words.pop()
+        else:
+            tail = ""
+        for word in words:
+            yield word
+    tail += decoder.decode(b"", final=True)
+    for word in tail.split():
+        yield word
+
+
+async def _iter_chunks(source, chunk_size: int) -> AsyncIterator:
+    if hasattr(source, "__aiter__"):
+        async for chunk in source:
+            yield chunk
+        return
+
+    read = getattr(source, "read", None)
+    if read is None:
+        raise TypeError(f"Unsupported text source: {type(source).__name__}")
+    is_async = asyncio.iscoroutinefunction(read)
+    while True:
+        if is_async:
+            chunk = await read(chunk_size)
+        else:
+            # Blocking reads (files, pipes) run off the event loop
+            chunk = await asyncio.to_thread(read, chunk_size)
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,126 @@
+"""Opt-in tracing of the frames exchanged with the glasses.
+
+Tracing is off until a sink is added, and the send and notification paths
+only check `tracer.active`, so no record is built and nothing is formatted
+or hexlified while nobody is listening. High-rate opcodes are sampled:
+
+    from even_glasses.trace import tracer
+    tracer.log_frames()  # DEBUG records on the "even_glasses.trace" logger
+    tracer.set_sample_rate(Command.SEND_RESULT, 10)  # 1 in 10
+"""
+import logging
+import time
+from typing import Callable, List, Optional
+
+from even_glasses.metrics import command_label
+from even_glasses.models import Command
+
+logger = logging.getLogger(__name__)
+
+TX = "tx"
+RX = "rx"
+
+# Trace 1 in N frames of these opcodes; all others are traced in full
+DEFAULT_SAMPLE_RATES = {
+    Command.RECEIVE_MIC_DATA: 50,  # ~50 packets/s while the mic is open
+}
+
+
+class TraceRecord:
+    """One traced frame; formatted only when a sink renders it."""
+
+    __slots__ = ("time", "direction", "device", "data", "sampled_out")
+
+    def __init__(self, time: float, direction: str, device: str, data: bytes, sampled_out: int):
+        self.time = time
+        self.direction = direction
+        self.device = device
+        self.data = data
+        self.sampled_out = sampled_out  # Frames of this opcode skipped per traced one
+
+    @property
+    def opcode(self) -> Optional[int]:
+        return self.data[0] if self.data else None
+
+    def as_dict(self) -> dict:
+        return {
+            "time": self.time,
+            "direction": self.direction,
+            "device": self.device,
+            "command": command_label(self.data[0]) if self.data else None,
+            "length": len(self.data),
+            "data": bytes(self.data).hex(),
+            "sampled_out": self.sampled_out,
+        }
+
+    def __str__(self) -> str:
+        command = command_label(self.data[0]) if self.data else "-"
+        sampled = f" (1 in {self.sampled_out + 1})" if self.sampled_out else ""
+        return f"{self.direction} {self.device} {command}: {bytes(self.data).hex()}{sampled}"
+
+
+TraceSink = Callable[[TraceRecord], None]
+
+
+class LoggingSink:
+    """Emit trace records through a logger; the text is built only if emitted."""
+
+    def __init__(self, target: Optional[logging.Logger] = None, level: int = logging.DEBUG):
+        self.logger = target or logger
+        self.level = level
+
+    def __call__(self, record: TraceRecord):
+        self.logger.log(self.level, "%s", record)
+
+
+class Tracer:
+    """Fans traced frames out to sinks, with per-opcode sampling."""
+
+    def __init__(self):
+        self.active = False
+        self._sinks: List[TraceSink] = []
+        self._every = [1] * 256
+        self._seen = [0] * 256
+        for opcode, every in DEFAULT_SAMPLE_RATES.items():
+            self._every[opcode] = every
+
+    def add_sink(self, sink: TraceSink) -> TraceSink:
+        self._sinks.append(sink)
+        self.active = True
+        return sink
+
+    def remove_sink(self, sink: TraceSink):
+        if sink in self._sinks:
+            self._sinks.remove(sink)
+        self.active = bool(self._sinks)
+
+    def log_frames(
+        self, target: Optional[logging.Logger] = None, level: int = logging.DEBUG
+    ) -> LoggingSink:
+        """Trace frames to a logger ("even_glasses.trace" by default)."""
+        return self.add_sink(LoggingSink(target, level))
+
+    def set_sample_rate(self, opcode: int, every: int):
+        """Trace 1 in `every` frames of `opcode`; 1 traces all of them."""
+        if every < 1:
+            raise ValueError("Sample rate must be at least 1")
+        self._every[opcode] = every
+        self._seen[opcode] = 0
+
+    def frame(self, direction: str, device: str, data: bytes):
+        """Trace one frame; callers check `active` first."""
+        opcode = data[0] if data else 0
+        seen = self._seen[opcode]
+        self._seen[opcode] = seen + 1
+        every = self._every[opcode]
+        if seen % every:
+            return
+        record = TraceRecord(time.monotonic(), direction, device, data, every - 1)
+        for sink in self._sinks:
+            try:
+                sink(record)
+            except Exception as e:
+                logger.warning(f"Trace sink {sink!r} failed: {e}")
+
+
+tracer = Tracer()
@@ -1,43 +1,44 @@
 import asyncio
 import logging
-import struct
-from even_glasses.models import Command, ResponseStatus, NCSNotification, Notification
+from even_glasses.models import Command, ResponseStatus, NCSNotification
+from even_glasses.encoders import encode_heartbeat, encode_notification
 
 
-async def wait_for_ack(device, timeout: int = 5):
+async def wait_for_ack(device, command: int, timeout: float = 5) -> bool:
+    """Wait for the next response to `command` from device and check it is an ACK.
+
+    To avoid missing a fast reply, prefer `device.send_and_wait` which
+    registers for the response before writing.
+    """
     try:
-        sender, data = await asyncio.wait_for(device.message_queue.get(), timeout)
-        if is_acknowledgment(data):
-            logging.info(f"Acknowledgment received from {device.name}")
-        else:
-            logging.warning(f"Unexpected data from {device.name}: {data.hex()}")
+        data = await asyncio.wait_for(device.expect_response(command), timeout)
     except asyncio.TimeoutError:
         logging.warning(f"Timeout waiting for acknowledgment from {device.name}")
+        return False
+    if is_acknowledgment(data):
+        logging.debug(f"Acknowledgment received from {device.name}")
+        return True
+    logging.warning(f"Unexpected data from {device.name}: {data.hex()}")
+    return False
 
 
 def is_acknowledgment(data: bytes) -> bool:
-    ACK_COMMAND = bytes([ResponseStatus.SUCCESS])
-    return data.startswith(ACK_COMMAND)
+    """Responses are [command, status, ...]; a bare status byte is accepted too."""
+    if not data:
+        return False
+    if data[0] == ResponseStatus.SUCCESS:
+        return True
+    if data[0] == Command.HEARTBEAT:
+        return True  # Heartbeats are acknowledged by echoing the packet
+    return len(data) > 1 and data[1] == ResponseStatus.SUCCESS
 
 
 def construct_heartbeat(seq: int) -> bytes:
-    length = 6
-    return struct.pack(
-        "BBBBBB",
-        Command.HEARTBEAT,
-        length & 0xFF,
-        (length >> 8) & 0xFF,
-        seq % 0xFF,
-        0x04,
-        seq % 0xFF,
-    )
-
-
-async def construct_notification(ncs_notification=NCSNotification):
-
-    # Create Notification instance
-    notification = Notification(ncs_notification=ncs_notification, type="Add")
-
-    # Get notification chunks
-    chunks = await notification.construct_notification()
-    return chunks
+    return encode_heartbeat(seq)
+
+
+async def construct_notification(
+    ncs_notification=NCSNotification, max_packet_size: int = 180
+):
+    # Kept async for compatibility; the encoding itself is synchronous
+    return encode_notification(ncs_notification, max_packet_size)
@@ -0,0 +1,478 @@
+"""Shard glasses pairs across worker processes.
+
+The parent keeps a WorkerPool: one process per shard, each running a
+GlassesFleet for its serials on its own event loop. Commands travel over a
+multiprocessing Pipe per worker; their text payloads are written into a
+per-worker shared memory ring so large texts are not pickled through the
+pipe. Workers report health and throughput on request.
+"""
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from even_glasses.models import NCSNotification, RSVPConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FRAME_BUFFER_SIZE = 1 << 20
+
+# A backend builds (client_factory, scanner) for a list of serials inside the
+# worker. It must be importable by name, e.g. even_glasses.simulator.simulated_backend.
+Backend = Callable[[List[str]], Tuple[Any, Any]]
+
+
+class SharedFrameRing:
+    """Byte ring in shared memory for passing payloads to one worker.
+
+    The parent writes a payload and sends its (offset, length) over the
+    pipe; the region is released when the worker's reply arrives. Regions
+    are reclaimed in allocation order, so one slow command only holds back
+    the space behind it.
+    """
+
+    def __init__(self, size: int = DEFAULT_FRAME_BUFFER_SIZE, name: Optional[str] = None):
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            self.shm = _attach_shared_memory(name)
+            self.owner = False
+        self.name = self.shm.name
+        self.size = self.shm.size
+        self._regions: Deque[List] = deque()  # [start, end, released]
+        self._tail = 0
+
+    def write(self, data: bytes) -> Optional[Tuple[int, int]]:
+        """Copy `data` into the ring; None if there is no room right now."""
+        length = len(data)
+        offset = self._allocate(length)
+        if offset is None:
+            return None
+        self.shm.buf[offset : offset + length] = data
+        self._regions.append([offset, offset + length, False])
+        self._tail = offset + length
+        return offset, length
+
+    def _allocate(self, length: int) -> Optional[int]:
+        if not self._regions:
+            return 0 if length <= self.size else None
+        head = self._regions[0][0]
+        # The live space has wrapped once the newest region starts before the
+        # oldest; the tail can then meet the head exactly with the ring full
+        if self._regions[-1][0] >= head:
+            if self.size - self._tail >= length:
+                return self._tail
+            if head >= length:
+                return 0  # Wrap to the start
+            return None
+        return self._tail if head - self._tail >= length else None
+
+    def release(self, offset: int):
+        for region in self._regions:
+            if region[0] == offset and not region[2]:
+                region[2] = True
+                break
+        while self._regions and self._regions[0][2]:
+            self._regions.popleft()
+
+    def read(self, offset: int, length: int) -> memoryview:
+        return self.shm.buf[offset : offset + length]
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    # The parent owns and unlinks the segment. Spawned workers share its
+    # resource tracker, so attaching does not register a second owner.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def shard(serials: Iterable[str], workers: int) -> List[List[str]]:
+    """Split serials round-robin into at most `workers` non-empty shards."""
+    shards: List[List[str]] = [[] for _ in range(max(1, workers))]
+    for index, serial in enumerate(serials):
+        shards[index % len(shards)].append(serial)
+    return [s for s in shards if s]
+
+
+class _WorkerHandle:
+    """Parent-side state of one worker process."""
+
+    def __init__(self, index: int, serials: List[str], process, conn, ring: SharedFrameRing):
+        self.index = index
+        self.serials = serials
+        self.process = process
+        self.conn = conn
+        self.ring = ring
+        self.pending: Dict[int, Tuple[asyncio.Future, Optional[int]]] = {}
+        self.send_lock = threading.Lock()
+        self.reader: Optional[threading.Thread] = None
+        self.ready: Optional[asyncio.Future] = None
+        self.completed = 0
+        self.failed = 0
+        self.inline_payloads = 0
+        self.last_health: Optional[Dict[str, Any]] = None
+
+
+class WorkerPool:
+    """Run GlassesFleet shards in separate processes behind one control plane.
+
+    Workers are spawned, so they do not inherit the parent's logging setup.
+    Pass `log_level` to have each worker call `logging.basicConfig` with it;
+    by default workers leave logging unconfigured.
+
+    Example:
+        pool = WorkerPool(["1", "2", "3", "4"], workers=2)
+        await pool.start()
+        await pool.send_text("Hello", serials=["3"])
+        print(await pool.health())
+        await pool.stop()
+    """
+
+    def __init__(
+        self,
+        serials: Iterable[str],
+        workers: Optional[int] = None,
+        backend: Optional[Backend] = None,
+        frame_buffer_size: int = DEFAULT_FRAME_BUFFER_SIZE,
+        connect_timeout: float = 10.0,
+        send_timeout: float = 10.0,
+        log_level: Optional[int] = None,
+    ):
+        self.serials = [str(serial) for serial in serials]
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        self.frame_buffer_size = frame_buffer_size
+        self.connect_timeout = connect_timeout
+        self.send_timeout = send_timeout
+        self.log_level = log_level
+        self._handles: List[_WorkerHandle] = []
+        self._route: Dict[str, _WorkerHandle] = {}
+        self._ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> int:
+        """Spawn the workers and wait until each has connected its pairs.
+
+        Returns the number of pairs connected across all workers.
+        """
+        self._loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context("spawn")
+        for index, serials in enumerate(shard(self.serials, self.workers)):
+            ring = SharedFrameRing(self.frame_buffer_size)
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=_worker_main,
+                args=(
+                    child_conn, ring.name, serials, self.backend,
+                    self.connect_timeout, self.send_timeout, self.log_level,
+                ),
+                name=f"even-glasses-worker-{index}",
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            handle = _WorkerHandle(index, serials, process, parent_conn, ring)
+            handle.ready = self._loop.create_future()
+            handle.reader = threading.Thread(
+                target=self._read_replies, args=(handle,), daemon=True
+            )
+            handle.reader.start()
+            self._handles.append(handle)
+            for serial in serials:
+                self._route[serial] = handle
+
+        connected = 0
+        for handle in self._handles:
+            try:
+                connected += await asyncio.wait_for(handle.ready, self.connect_timeout + 30)
+            except (asyncio.TimeoutError, EOFError) as e:
+                logger.error(f"Worker {handle.index} did not start: {e!r}")
+        logger.info(f"{len(self._handles)} workers started, {connected} pairs connected")
+        return connected
+
+    def _read_replies(self, handle: _WorkerHandle):
+        # Blocking pipe reads stay off the event loop
+        while True:
+            try:
+                message = handle.conn.recv()
+            except (EOFError, OSError):
+                self._loop.call_soon_threadsafe(self._worker_gone, handle)
+                return
+            self._loop.call_soon_threadsafe(self._handle_reply, handle, message)
+
+    def _handle_reply(self, handle: _WorkerHandle, message):
+        request_id, ok, result = message
+        if request_id == 0:  # Startup report
+            if not handle.ready.done():
+                handle.ready.set_result(result)
+            return
+        future, offset = handle.pending.pop(request_id, (None, None))
+        if offset is not None:
+            handle.ring.release(offset)
+        if future is None or future.done():
+            return
+        if ok:
+            handle.completed += 1
+            future.set_result(result)
+        else:
+            handle.failed += 1
+            future.set_exception(RuntimeError(result))
+
+    def _worker_gone(self, handle: _WorkerHandle):
+        if handle.ready and not handle.ready.done():
+            handle.ready.set_exception(EOFError(f"Worker {handle.index} exited"))
+        for future, _ in handle.pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError(f"Worker {handle.index} exited"))
+        handle.pending.clear()
+
+    async def _request(
+        self, handle: _WorkerHandle, op: str, payload: bytes = b"", **params
+    ) -> Any:
+        request_id = next(self._ids)
+        ref = handle.ring.write(payload) if payload else None
+        if payload and ref is None:
+            handle.inline_payloads += 1  # Ring full: fall back to the pipe
+        future = self._loop.create_future()
+        handle.pending[request_id] = (future, ref[0] if ref else None)
+        message = (request_id, op, ref if ref else payload, params)
+        with handle.send_lock:
+            handle.conn.send(message)
+        return await future
+
+    async def _fan_out(
+        self, op: str, payload: bytes, serials: Optional[Iterable[str]], **params
+    ) -> Dict[str, Any]:
+        """Send one request per worker owning any of `serials` (all if None)."""
+        groups: Dict[int, List[str]] = {}
+        for serial in self.serials if serials is None else serials:
+            handle = self._route.get(str(serial))
+            if handle is None:
+                raise KeyError(f"No worker owns pair {serial}")
+            groups.setdefault(handle.index, []).append(str(serial))
+        handles = [self._handles[index] for index in groups]
+        replies = await asyncio.gather(
+            *(
+                self._request(handle, op, payload, serials=groups[handle.index], **params)
+                for handle in handles
+            ),
+            return_exceptions=True,
+        )
+        results: Dict[str, Any] = {}
+        for handle, reply in zip(handles, replies):
+            if isinstance(reply, Exception):
+                results.update({serial: reply for serial in groups[handle.index]})
+            else:
+                results.update(reply)
+        return results
+
+    async def send_text(self, text: str, serials: Optional[Iterable[str]] = None, **kwargs) -> Dict[str, Any]:
+        return await self._fan_out("text", text.encode("utf-8"), serials, kwargs=kwargs)
+
+    async def send_rsvp(
+        self,
+        text: str,
+        config: Optional[RSVPConfig] = None,
+        serials: Optional[Iterable[str]] = None,
+        send_timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        config = (config or RSVPConfig()).model_dump()
+        return await self._fan_out(
+            "rsvp", text.encode("utf-8"), serials, config=config, send_timeout=send_timeout
+        )
+
+    async def send_notification(
+        self, notification: NCSNotification, serials: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        payload = notification.model_dump_json().encode("utf-8")
+        return await self._fan_out("notification", payload, serials)
+
+    async def health(self, timeout: float = 2.0) -> Dict[int, Dict[str, Any]]:
+        """Per-worker health: liveness, connected pairs and throughput."""
+        report = {}
+        for handle in self._handles:
+            entry: Dict[str, Any] = {
+                "pid": handle.process.pid,
+                "alive": handle.process.is_alive(),
+                "serials": handle.serials,
+                "pending": len(handle.pending),
+                "completed": handle.completed,
+                "failed": handle.failed,
+                "inline_payloads": handle.inline_payloads,
+            }
+            if entry["alive"]:
+                try:
+                    stats = await asyncio.wait_for(self._request(handle, "health"), timeout)
+                    previous = handle.last_health
+                    if previous:
+                        elapsed = stats["uptime"] - previous["uptime"]
+                        if elapsed > 0:
+                            stats["commands_per_s"] = (stats["commands"] - previous["commands"]) / elapsed
+                            stats["bytes_per_s"] = (stats["payload_bytes"] - previous["payload_bytes"]) / elapsed
+                    handle.last_health = stats
+                    entry.update(stats)
+                    entry["responsive"] = True
+                except (asyncio.TimeoutError, RuntimeError):
+                    entry["responsive"] = False
+            report[handle.index] = entry
+        return report
+
+    async def stop(self, timeout: float = 5.0):
+        """Disconnect every pair and shut the workers down."""
+        for handle in self._handles:
+            if handle.process.is_alive():
+                try:
+                    await asyncio.wait_for(self._request(handle, "stop"), timeout)
+                except Exception as e:
+                    logger.warning(f"Worker {handle.index} did not stop cleanly: {e!r}")
+        for handle in self._handles:
+            await asyncio.to_thread(handle.process.join, timeout)
+            if handle.process.is_alive():
+                handle.process.terminate()
+            handle.conn.close()
+            handle.ring.close()
+        self._handles.clear()
+        self._route.clear()
+
+
+def _worker_main(
+    conn,
+    ring_name: str,
+    serials: List[str],
+    backend,
+    connect_timeout: float,
+    send_timeout: float,
+    log_level: Optional[int] = None,
+):
+    """Entry point of a worker process."""
+    if log_level is not None:
+        logging.basicConfig(level=log_level)
+    asyncio.run(_serve(conn, ring_name, serials, backend, connect_timeout, send_timeout))
+
+
+async def _serve(conn, ring_name, serials, backend, connect_timeout, send_timeout):
+    from even_glasses.fleet import GlassesFleet
+
+    loop = asyncio.get_running_loop()
+    ring = SharedFrameRing(name=ring_name)
+    client_factory, scanner = backend(serials) if backend else (None, None)
+    kwargs = {"scanner": scanner} if scanner is not None else {}
+    fleet = GlassesFleet(
+        client_factory=client_factory, serials=serials, send_timeout=send_timeout, **kwargs
+    )
+    connected = await fleet.scan_and_connect(timeout=connect_timeout, expected_pairs=len(serials))
+    conn.send((0, True, connected))
+
+    started = time.monotonic()
+    stats = {"commands": 0, "errors": 0, "payload_bytes": 0, "busy": 0.0}
+    lag = [0.0]
+    send_lock = threading.Lock()
+    messages: asyncio.Queue = asyncio.Queue()
+
+    def reply(message):
+        with send_lock:
+            conn.send(message)
+
+    async def measure_lag():
+        # How late the loop runs a 100 ms timer: a saturated loop shows up here
+        while True:
+            before = loop.time()
+            await asyncio.sleep(0.1)
+            lag[0] = max(0.0, loop.time() - before - 0.1)
+
+    def read_messages():
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                message = None
+            loop.call_soon_threadsafe(messages.put_nowait, message)
+            if message is None:
+                return
+
+    async def handle(request_id, op, payload, params):
+        begin = time.monotonic()
+        try:
+            if isinstance(payload, tuple):
+                data = bytes(ring.read(*payload))
+            else:
+                data = payload
+            stats["payload_bytes"] += len(data)
+            targets = params.get("serials")
+            if op == "text":
+                result = await fleet.send_text(data.decode("utf-8"), serials=targets, **params.get("kwargs", {}))
+            elif op == "rsvp":
+                config = RSVPConfig(**params["config"])
+                result = await fleet.send_rsvp(
+                    data.decode("utf-8"), config, serials=targets, send_timeout=params.get("send_timeout")
+                )
+            elif op == "notification":
+                notification = NCSNotification.model_validate_json(data)
+                result = await fleet.send_notification(notification, serials=targets)
+            else:
+                raise ValueError(f"Unknown command {op!r}")
+            # Exceptions are reported as text so the reply always pickles
+            result = {
+                serial: repr(value) if isinstance(value, BaseException) else value
+                for serial, value in result.items()
+            }
+            stats["commands"] += 1
+            reply((request_id, True, result))
+        except Exception as e:
+            stats["errors"] += 1
+            reply((request_id, False, repr(e)))
+        finally:
+            stats["busy"] += time.monotonic() - begin
+
+    lag_task = asyncio.create_task(measure_lag())
+    threading.Thread(target=read_messages, daemon=True).start()
+    tasks = set()
+    message = None
+    try:
+        while True:
+            message = await messages.get()
+            if message is None:
+                break
+            request_id, op, payload, params = message
+            if op == "health":
+                reply(
+                    (
+                        request_id,
+                        True,
+                        {
+                            **stats,
+                            "uptime": time.monotonic() - started,
+                            "connected_pairs": len(fleet.connected_pairs()),
+                            "active_commands": len(tasks),
+                            "loop_lag": lag[0],
+                        },
+                    )
+                )
+            elif op == "stop":
+                break
+            else:
+                task = asyncio.create_task(handle(request_id, op, payload, params))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+    finally:
+        lag_task.cancel()
+        for task in tasks:
+            task.cancel()
+        await fleet.disconnect_all()
+        if message is not None:
+            reply((message[0], True, None))
+        ring.close()
@@ -1,10 +1,12 @@
 import asyncio
 import argparse
 import logging
+import os
 from even_glasses.bluetooth_manager import GlassesManager
+from even_glasses.device_cache import DeviceCache
 from even_glasses.commands import send_text, send_rsvp, send_notification
-from even_glasses.models import RSVPConfig, NCSNotification
-from even_glasses.notification_handlers import handle_incoming_notification
+from even_glasses.models import Command, RSVPConfig, NCSNotification
+from even_glasses.notification_handlers import handle_ai_event
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -42,7 +44,7 @@ def parse_args():
     return args
 
 
-async def test_rsvp(manager: GlassesManager, text: str, config: RSVPConfig):
+async def test_rsvp(manager: GlassesManager, input_file: str, config: RSVPConfig):
     if not manager.left_glass or not manager.right_glass:
         logger.error("Could not connect to glasses devices.")
         return
@@ -50,7 +52,9 @@ async def test_rsvp(manager: GlassesManager, text: str, config: RSVPConfig):
         manager, "Init message!"
     )  # Initialize Even AI message sending
     await asyncio.sleep(5)
-    await send_rsvp(manager, text, config)
+    # Stream the file so long inputs are never loaded into memory at once
+    with open(input_file, "r", encoding="utf-8") as f:
+        await send_rsvp(manager, f, config)
     await asyncio.sleep(3)
     await send_text(manager, "RSVP Done! Restarting in 3 seconds")
     await asyncio.sleep(3)
@@ -73,10 +77,7 @@ async def test_notification(manager: GlassesManager, notification: NCSNotificati
 async def main():
     args = parse_args()
 
-    try:
-        with open(args.input_file, "r", encoding="utf-8") as f:
-            text = f.read()
-    except FileNotFoundError:
+    if not os.path.isfile(args.input_file):
         logger.error(f"Input file not found: {args.input_file}")
         return
 
@@ -84,22 +85,23 @@ async def main():
         words_per_group=args.words_per_group, wpm=args.wpm, padding_char="..."
     )
 
-    manager = GlassesManager(left_address=None, right_address=None)
+    manager = GlassesManager(
+        left_address=None, right_address=None, device_cache=DeviceCache()
+    )
     connected = await manager.scan_and_connect()
 
     if connected:
-        # Assign notification handlers
-        if manager.left_glass:
-            manager.left_glass.notification_handler = handle_incoming_notification
-        if manager.right_glass:
-            manager.right_glass.notification_handler = handle_incoming_notification
+        # Log touchpad / AI events from both glasses
+        manager.subscribe(Command.START_AI, handle_ai_event)
 
         counter = 1
 
         try:
             while True:
                 if args.rsvp:
-                    await test_rsvp(manager=manager, text=text, config=config)
+                    await test_rsvp(
+                        manager=manager, input_file=args.input_file, config=config
+                    )
                 elif args.text:
                     message = f"Test message {counter}"
                     await test_text(manager=manager, text=message)
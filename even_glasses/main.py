@@ -1,16 +1,16 @@
-import asyncio
 import json
 import flet as ft
 from even_glasses.bluetooth_manager import GlassesManager
+from even_glasses.device_cache import DeviceCache
 from even_glasses.commands import send_text, send_rsvp, send_notification
-from even_glasses.models import NCSNotification, RSVPConfig
+from even_glasses.models import ConnectionState, NCSNotification, RSVPConfig
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize GlassesManager
-manager = GlassesManager(left_address=None, right_address=None)
+manager = GlassesManager(left_address=None, right_address=None, device_cache=DeviceCache())
 
 async def main(page: ft.Page):
     page.title = "Glasses Control Panel"
@@ -232,19 +232,19 @@ End of demo text. Thank you for trying out the RSVP feature!"""
 
         previous_connected = connected
 
-        if left_glass and left_glass.client.is_connected:
-            left_status.value = f"Left Glass ({left_glass.name[:13]}): Connected"
+        if left_glass and left_glass.state != ConnectionState.DISCONNECTED:
+            left_status.value = f"Left Glass ({left_glass.name[:13]}): {left_glass.state.value.title()}"
         else:
             left_status.value = "Left Glass: Disconnected"
 
-        if right_glass and right_glass.client.is_connected:
-            right_status.value = f"Right Glass ({right_glass.name[:13]}): Connected"
+        if right_glass and right_glass.state != ConnectionState.DISCONNECTED:
+            right_status.value = f"Right Glass ({right_glass.name[:13]}): {right_glass.state.value.title()}"
         else:
             right_status.value = "Right Glass: Disconnected"
 
-        connected = (
-            (left_glass and left_glass.client.is_connected)
-            or (right_glass and right_glass.client.is_connected)
+        connected = bool(
+            (left_glass and left_glass.state == ConnectionState.CONNECTED)
+            or (right_glass and right_glass.state == ConnectionState.CONNECTED)
         )
 
         if connected != previous_connected:
@@ -387,12 +387,12 @@ End of demo text. Thank you for trying out the RSVP feature!"""
 
     page.add(main_content)
 
-    # Background task to monitor status
-    async def status_monitor():
-        while True:
-            await asyncio.sleep(1)  # Check every 1 second
-            on_status_changed()
+    # Redraw the status only when a glass changes connection state
+    def on_state_change(glass, state):
+        if state == ConnectionState.FAILED:
+            log_message(f"{glass.side.capitalize()} glass connection failed.")
+        on_status_changed()
 
-    asyncio.create_task(status_monitor())
+    manager.add_state_listener(on_state_change)
 
 ft.app(target=main)
\ No newline at end of file
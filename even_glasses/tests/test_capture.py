@@ -0,0 +1,71 @@
+"""Capturing a session and replaying it against the simulator."""
+import asyncio
+import os
+import sys
+
+from even_glasses.capture import KIND_IN, KIND_OUT, capture_info, read_capture
+from even_glasses.commands import send_text
+from even_glasses.models import Command
+from even_glasses.replay import main, replay
+
+from tests.test_glasses_manager import FAST, connect
+
+
+def record_session(path: str) -> dict:
+    """Capture a send_text on a simulated pair; returns what each arm received."""
+
+    async def scenario():
+        pair, manager = await connect()
+        try:
+            manager.start_capture(path)
+            assert await send_text(manager, "captured " * 40, duration=0)
+            manager.stop_capture()
+            assert manager.left_glass.capture is None
+            # Frames after stop_capture are not recorded
+            assert await send_text(manager, "not captured", duration=0)
+        finally:
+            await manager.disconnect_all()
+        return {arm.name: [f for f in arm.frames if f[0] == Command.SEND_RESULT] for arm in pair.devices}
+
+    return asyncio.run(scenario())
+
+
+def test_capture_records_both_directions(tmp_path):
+    path = os.path.join(tmp_path, "session.egcap")
+    received = record_session(path)
+    frames = list(read_capture(path))
+    for name, arm_frames in received.items():
+        out = [f.data for f in frames if f.device == name and f.kind == KIND_OUT]
+        acks = [f for f in frames if f.device == name and f.kind == KIND_IN]
+        assert len(acks) == len(out)  # Heartbeats may be in there too
+        shown = [data for data in out if data[0] == Command.SEND_RESULT]
+        assert shown == arm_frames[: len(shown)] and len(shown) < len(arm_frames)
+    times = [f.time for f in frames]
+    assert times == sorted(times)
+
+    info = capture_info(path)
+    assert info["out"] == info["in"] == len(frames) // 2
+    assert set(info["devices"]) == set(received)
+
+    # A record cut short by a crash is skipped
+    with open(path, "ab") as f:
+        f.write(b"\x00" * 7)
+    assert list(read_capture(path)) == frames
+
+
+def test_capture_replays_against_the_simulator(tmp_path, monkeypatch, capsys):
+    path = os.path.join(tmp_path, "session.egcap")
+    record_session(path)
+    out_frames = capture_info(path)["out"]
+
+    summary = asyncio.run(replay(path, speed=0, config=FAST))
+    assert summary["frames"] == summary["sent"] == out_frames
+    assert summary["failed"] == 0
+    assert summary["left_write_p50"] is not None
+
+    monkeypatch.setattr(sys, "argv", ["replay", "info", path])
+    main()
+    assert f"{out_frames} out" in capsys.readouterr().out
+    monkeypatch.setattr(sys, "argv", ["replay", "dump", path])
+    main()
+    assert len(capsys.readouterr().out.splitlines()) == 2 * out_frames
@@ -0,0 +1,74 @@
+"""DeviceCache persistence and its use by scan_and_connect."""
+import asyncio
+import os
+
+from even_glasses.bluetooth_manager import GlassesManager
+from even_glasses.device_cache import DeviceCache, pairing_key
+from even_glasses.simulator import SimulatedGlassesPair, SimulatedScanner
+
+from tests.test_glasses_manager import FAST
+
+
+def test_pairing_key_comes_from_the_advertised_name():
+    assert pairing_key("Even G1_42_L_ABC123") == "42"
+    assert pairing_key("Even G1_42_R_ABC124") == "42"
+    assert pairing_key("Something else") == "default"
+    assert pairing_key(None) == "default"
+
+
+def test_cache_round_trips_and_invalidates(tmp_path):
+    path = os.path.join(tmp_path, "nested", "devices.json")
+    cache = DeviceCache(path)
+    assert cache.get() is None
+    cache.put("left", "Even G1_7_L_A", "AA")
+    cache.put("right", "Even G1_7_R_B", "BB")
+    cache.put("left", "Even G1_8_L_C", "CC")  # Most recently used pairing
+
+    reloaded = DeviceCache(path)
+    assert reloaded.get().left.address == "CC"
+    assert reloaded.get("7").right.address == "BB"
+    reloaded.invalidate("left", "Even G1_8_L_C")
+    assert DeviceCache(path).get("8") is None  # Empty pairings are removed
+    assert DeviceCache(path).get().left.address == "AA"
+
+
+def test_unreadable_cache_is_ignored(tmp_path):
+    path = os.path.join(tmp_path, "devices.json")
+    with open(path, "w") as f:
+        f.write("{not json")
+    cache = DeviceCache(path)
+    assert cache.get() is None
+    cache.put("left", "Even G1_1_L_A", "AA")
+    assert DeviceCache(path).get().left.address == "AA"
+
+
+class CountingScanner(SimulatedScanner):
+    def __init__(self, devices, detection_callback=None, starts=None):
+        super().__init__(devices, detection_callback)
+        self.starts = [] if starts is None else starts
+
+    def __call__(self, detection_callback=None, **kwargs):
+        return CountingScanner(self.devices, detection_callback, self.starts)
+
+    async def start(self):
+        self.starts.append(True)
+        await super().start()
+
+
+def test_cached_arms_connect_before_they_advertise(tmp_path):
+    async def scenario():
+        # Adverts come late; only the cached addresses can connect in time
+        pair = SimulatedGlassesPair(config=FAST.model_copy(update={"advertise_delay": 30}))
+        cache = DeviceCache(os.path.join(tmp_path, "devices.json"))
+        for device in pair.devices:
+            cache.put(device.side, device.name, device.address)
+        scanner = CountingScanner(pair.devices)
+        manager = GlassesManager(client_factory=pair.client_factory, scanner=scanner, device_cache=cache)
+        try:
+            assert await asyncio.wait_for(manager.scan_and_connect(timeout=10), 1)
+            assert manager.left_glass.address == pair.left.address
+            assert scanner.starts == [True]  # Scanned in case the cache was stale
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
@@ -0,0 +1,57 @@
+"""Per-opcode routing of incoming packets."""
+import asyncio
+
+from even_glasses.dispatcher import AIEvent, MicDataEvent, PacketDispatcher
+from even_glasses.models import Command
+
+
+def mic_packet(seq: int) -> bytes:
+    return bytes([Command.RECEIVE_MIC_DATA, seq]) + bytes([seq]) * 4
+
+
+def test_sync_mic_handlers_share_one_event():
+    async def scenario():
+        dispatcher = PacketDispatcher()
+        events = []
+        dispatcher.subscribe(Command.RECEIVE_MIC_DATA, lambda event: events.append((event, event.seq)))
+        for seq in range(3):
+            await dispatcher.dispatch(mic_packet(seq))
+        assert [seq for _, seq in events] == [0, 1, 2]
+        assert len({id(event) for event, _ in events}) == 1
+        assert isinstance(events[0][0], MicDataEvent)
+
+    asyncio.run(scenario())
+
+
+def test_async_mic_handler_keeps_its_packet_across_awaits():
+    async def scenario():
+        dispatcher = PacketDispatcher()
+        seen = []
+
+        async def handler(event):
+            seq = event.seq
+            await asyncio.sleep(0.01)  # Later packets arrive meanwhile
+            seen.append((seq, event.seq, bytes(event.audio)))
+
+        dispatcher.subscribe(Command.RECEIVE_MIC_DATA, handler)
+        # bleak runs each notification coroutine as its own task
+        await asyncio.gather(*(dispatcher.dispatch(mic_packet(seq)) for seq in range(3)))
+        assert sorted(seen) == [(seq, seq, bytes([seq]) * 4) for seq in range(3)]
+
+        dispatcher.unsubscribe(Command.RECEIVE_MIC_DATA, handler)
+        assert not dispatcher.has_subscribers(Command.RECEIVE_MIC_DATA)
+
+    asyncio.run(scenario())
+
+
+def test_events_are_typed_by_opcode():
+    async def scenario():
+        dispatcher = PacketDispatcher()
+        events = []
+        dispatcher.subscribe(Command.START_AI, events.append)
+        await dispatcher.dispatch(bytes([Command.START_AI, 0x17]))
+        await dispatcher.dispatch(bytes([Command.HEARTBEAT, 6, 0, 1, 4, 1]))  # No subscriber
+        assert len(events) == 1
+        assert isinstance(events[0], AIEvent) and events[0].subcommand == 0x17
+
+    asyncio.run(scenario())
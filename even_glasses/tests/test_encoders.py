@@ -0,0 +1,64 @@
+"""Packet encoders against the byte layout of the G1 protocol."""
+from even_glasses.commands import construct_mic_command, construct_start_ai
+import pytest
+
+from even_glasses.encoders import SendResultPacket, encode_heartbeat, encode_notification
+from even_glasses.models import Command, MicStatus, NCSNotification, SendResult, SubCommand, split_utf8
+
+
+def test_split_utf8_never_cuts_a_character():
+    data = "héllo wörld ✓ 😀 done".encode("utf-8")
+    for size in range(4, 12):  # At least one 4-byte character per chunk
+        chunks = split_utf8(data, size)
+        assert b"".join(chunks) == data
+        for chunk in chunks:
+            chunk.decode("utf-8")  # Raises on a split character
+            assert len(chunk) <= size
+    assert split_utf8(b"", 10) == [b""]
+
+
+def test_send_result_model_and_packet_agree():
+    text = ("page text with ünïcode " * 20).encode("utf-8")
+    model = SendResult(data=text, seq=3, page_number=2, max_pages=4)
+    packet = SendResultPacket(text, page_number=2, max_pages=4, seq=3)
+    for size in (244, 100, 40):
+        assert model.fragment(size) == packet.fragment(size)
+    frames = packet.fragment(100)
+    assert len(frames) > 1 and all(len(frame) <= 100 for frame in frames)
+    assert [frame[2:4] for frame in frames] == [bytes([len(frames), i]) for i in range(len(frames))]
+    assert b"".join(frame[9:] for frame in frames) == text
+    custom = SendResult(command=0x4B, data=b"x")
+    assert custom.build()[0] == 0x4B
+    assert all(frame[0] == 0x4B for frame in custom.model_copy(update={"data": text}).fragment(100))
+
+
+def test_fragment_limits():
+    assert SendResult(data=b"short").fragment(16) == [SendResult(data=b"short", total_packages=1).build()]
+    with pytest.raises(ValueError):
+        SendResult(data=b"x" * 20).fragment(12)  # Room for only 3 data bytes
+    with pytest.raises(ValueError):
+        SendResult(data=b"x" * 256 * 10).fragment(19)  # 256 packages
+
+
+def test_small_command_encoders():
+    assert construct_mic_command(MicStatus.ENABLE) == bytes([Command.OPEN_MIC, 1])
+    assert construct_start_ai(SubCommand.STOP, b"\x01") == bytes([Command.START_AI, SubCommand.STOP, 1])
+    assert encode_heartbeat(0x1FF) == bytes([Command.HEARTBEAT, 6, 0, 0xFF, 4, 0xFF])
+
+
+def test_notification_frames_carry_headers():
+    notification = NCSNotification(
+        msg_id=1,
+        app_identifier="org.example.chat",
+        title="Title",
+        subtitle="Subtitle",
+        message="x" * 400,
+        display_name="Chat",
+    )
+    frames = encode_notification(notification, max_packet_size=100)
+    assert len(frames) > 1
+    for index, frame in enumerate(frames):
+        assert bytes(frame[:4]) == bytes([Command.NOTIFICATION, 0, len(frames), index])
+        assert len(frame) <= 100
+    payload = b"".join(bytes(frame[4:]) for frame in frames)
+    assert b'"message":"' + b"x" * 400 in payload
@@ -0,0 +1,50 @@
+"""GlassesFleet against simulated pairs."""
+import asyncio
+
+from even_glasses.commands import rsvp_duration
+from even_glasses.fleet import GlassesFleet
+from even_glasses.models import RSVPConfig
+from even_glasses.simulator import SimulatedFleet
+
+from tests.test_glasses_manager import FAST
+
+
+async def connect_fleet(count: int, send_timeout: float) -> GlassesFleet:
+    sim = SimulatedFleet(count=count, config=FAST)
+    fleet = GlassesFleet(client_factory=sim.client_factory, scanner=sim.scanner, send_timeout=send_timeout)
+    assert await fleet.scan_and_connect(timeout=2, expected_pairs=count) == count
+    return fleet
+
+
+def test_rsvp_duration_counts_groups_and_lead_in():
+    config = RSVPConfig(wpm=600, words_per_group=2)
+    # 3 groups plus 1 lead-in slot, 0.2 s each
+    assert abs(rsvp_duration("a b c d e", config) - 0.8) < 1e-9
+
+
+def test_rsvp_longer_than_send_timeout_completes():
+    async def scenario():
+        fleet = await connect_fleet(2, send_timeout=0.3)
+        try:
+            text = " ".join(f"w{i}" for i in range(8))
+            results = await fleet.send_rsvp(text, RSVPConfig(wpm=600, words_per_group=1))
+            assert results and all(result is True for result in results.values())
+        finally:
+            await fleet.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_explicit_rsvp_timeout_is_reported_per_pair():
+    async def scenario():
+        fleet = await connect_fleet(2, send_timeout=5)
+        try:
+            text = " ".join(f"w{i}" for i in range(50))
+            results = await asyncio.wait_for(
+                fleet.send_rsvp(text, RSVPConfig(wpm=600), send_timeout=0.3), 3
+            )
+            assert results and all(isinstance(r, asyncio.TimeoutError) for r in results.values())
+        finally:
+            await fleet.disconnect_all()
+
+    asyncio.run(scenario())
@@ -0,0 +1,427 @@
+"""GlassesManager, Glass and BleDevice driven against the simulator."""
+import asyncio
+
+from bleak.exc import BleakError
+
+from even_glasses.bluetooth_manager import Glass, GlassesManager
+from even_glasses.commands import play_rsvp, send_rsvp, send_text
+from even_glasses.models import Command, ConnectionState, ResponseStatus, RSVPConfig
+from even_glasses.simulator import SimulatedGlassesPair, SimulatorConfig
+
+FAST = SimulatorConfig(latency=0.001, connect_delay=0.001, advertise_delay=0.001, seed=1)
+
+
+async def connect(config: SimulatorConfig = FAST):
+    pair = SimulatedGlassesPair(config=config)
+    manager = GlassesManager(client_factory=pair.client_factory, scanner=pair.scanner)
+    assert await manager.scan_and_connect(timeout=2)
+    return pair, manager
+
+
+async def wait_for_state(glass, state: ConnectionState, timeout: float = 2.0):
+    async def wait():
+        while glass.state != state:
+            await asyncio.sleep(0.005)
+
+    await asyncio.wait_for(wait(), timeout)
+
+
+def display_frames(device) -> list:
+    return [frame for frame in device.frames if frame[0] == Command.SEND_RESULT]
+
+
+def test_send_text_reaches_both_arms():
+    async def scenario():
+        pair, manager = await connect()
+        try:
+            assert await send_text(manager, "hello simulator", duration=0, cache=None)
+            for device in pair.devices:
+                frames = display_frames(device)
+                assert frames, f"{device.side} arm got no text"
+                assert b"hello simulator" in b"".join(frames)
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_ack_timeout_when_writes_are_lost():
+    async def scenario():
+        pair, manager = await connect()
+        try:
+            pair.left.config = FAST.model_copy(update={"packet_loss": 1.0})
+            glass = manager.left_glass
+            timeouts = glass.metrics.ack_timeouts.value
+            packet = bytes([Command.QUICK_NOTE, 0x00])
+            assert not await glass.send_and_wait(packet, timeout=0.05)
+            assert glass.metrics.ack_timeouts.value == timeouts + 1
+
+            # The link recovers as soon as replies come back
+            pair.left.config = FAST
+            assert await glass.send_and_wait(packet, timeout=0.5)
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_reconnect_replays_display():
+    async def scenario():
+        pair, manager = await connect()
+        try:
+            assert await send_text(manager, "still here", duration=0, cache=None)
+            glass = manager.left_glass
+            shown = display_frames(pair.left)[-1]
+            pair.left.frames.clear()
+
+            pair.left.drop_link()
+            assert glass.state == ConnectionState.RECONNECTING
+            await wait_for_state(glass, ConnectionState.CONNECTED)
+            await asyncio.sleep(0.05)  # Let the replay finish
+
+            assert glass.reconnects == 1
+            assert shown in display_frames(pair.left)
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_send_does_not_swallow_later_acks():
+    async def scenario():
+        slow = FAST.model_copy(update={"latency": 0.05})
+        pair, manager = await connect(slow)
+        try:
+            glass = manager.left_glass
+            packet = bytes([Command.QUICK_NOTE, 0x00])
+            task = asyncio.create_task(glass.send_and_wait_many([packet] * 3, timeout=1))
+            await asyncio.sleep(0.07)  # Cancel during the second write
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            assert await glass.send_and_wait(packet, timeout=0.5)
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_cancel_is_not_lost_when_the_ack_lands_in_the_same_tick():
+    async def scenario():
+        pair, manager = await connect(FAST.model_copy())
+        try:
+            glass = manager.left_glass
+            pair.left.config.packet_loss = 1.0  # Only the ACK below answers
+            packet = bytes([Command.QUICK_NOTE, 0x00])
+            dropped = pair.left.dropped
+            task = asyncio.create_task(glass.send_and_wait(packet, timeout=1))
+            while pair.left.dropped == dropped:
+                await asyncio.sleep(0.001)
+            await asyncio.sleep(0.01)  # Written, now waiting for the ACK
+            glass._resolve_response(bytes([Command.QUICK_NOTE, ResponseStatus.SUCCESS]))
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            assert task.cancelled()
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_rsvp_cancellation_finishes_and_clears_display():
+    async def scenario():
+        pair, manager = await connect()
+        try:
+            words = " ".join(f"word{i}" for i in range(200))
+            config = RSVPConfig(wpm=300, words_per_group=1)
+            timeouts = manager.left_glass.metrics.ack_timeouts.value
+            task = asyncio.create_task(send_rsvp(manager, words, config))
+            await asyncio.sleep(0.5)
+            task.cancel()
+            done, _ = await asyncio.wait({task}, timeout=2)
+            assert task in done, "RSVP did not finish after cancellation"
+            assert task.cancelled()
+            assert b"--" in display_frames(pair.left)[-1]
+            # The clearing frame was acknowledged, so the link is still usable
+            assert manager.left_glass.metrics.ack_timeouts.value == timeouts
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_rsvp_source_error_ends_playback():
+    async def failing_source():
+        yield "one two three "
+        raise IOError("source went away")
+
+    async def scenario():
+        pair, manager = await connect()
+        try:
+            config = RSVPConfig(wpm=3000, words_per_group=1)
+            stats = await asyncio.wait_for(play_rsvp(manager, failing_source(), config), 5)
+            assert not stats.completed
+            assert stats.words_displayed == 3
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_heartbeats_continue_while_mic_streams():
+    async def scenario():
+        pair = SimulatedGlassesPair(config=FAST.model_copy(update={"mic_interval": 0.01}))
+        glass = Glass(
+            pair.right.name,
+            pair.right.address,
+            "right",
+            heartbeat_freq=0.1,
+            client_factory=pair.client_factory,
+        )
+        await glass.connect()
+        try:
+            mic = await glass.start_mic()
+            assert mic is not None
+            await asyncio.sleep(0.55)
+            # Inbound mic packets must not stand in for our own writes
+            assert mic.received > 20
+            assert glass.heartbeats_sent >= 3
+        finally:
+            await glass.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_rsvp_padding_is_not_counted_as_words():
+    async def scenario():
+        pair, manager = await connect()
+        try:
+            text = " ".join(f"w{i}" for i in range(11))
+            for prerender in (True, False):
+                config = RSVPConfig(wpm=6000, words_per_group=2, prerender=prerender)
+                stats = await play_rsvp(manager, text, config)
+                assert stats.completed
+                assert stats.words_displayed == 11
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_disconnect_all_stops_a_glass_that_is_reconnecting():
+    async def scenario():
+        pair, manager = await connect()
+        glass = manager.left_glass
+        states = []
+        glass.add_state_listener(lambda device, state: states.append(state))
+        pair.left.drop_link()
+        await wait_for_state(glass, ConnectionState.RECONNECTING)
+        await manager.disconnect_all()
+        await asyncio.sleep(0.05)  # Give a stray reconnect time to land
+        assert glass.state == ConnectionState.DISCONNECTED
+        assert not glass.client.is_connected
+        assert glass.heartbeat_task.done()
+        assert states[0] == ConnectionState.RECONNECTING
+        assert states[-1] == ConnectionState.DISCONNECTED
+
+    asyncio.run(scenario())
+
+
+def test_state_listeners_see_each_transition(caplog):
+    async def scenario():
+        pair = SimulatedGlassesPair(config=FAST)
+        manager = GlassesManager(client_factory=pair.client_factory, scanner=pair.scanner)
+        seen = []
+        awaited = []
+
+        async def slow_listener(glass, state):
+            await asyncio.sleep(0.01)
+            awaited.append((glass.side, state))
+
+        async def broken_listener(glass, state):
+            raise RuntimeError("listener broke")
+
+        manager.add_state_listener(lambda glass, state: seen.append((glass.side, state)))
+        manager.add_state_listener(slow_listener)
+        manager.add_state_listener(broken_listener)
+        assert await manager.scan_and_connect(timeout=2)
+        pair.right.drop_link()
+        await wait_for_state(manager.right_glass, ConnectionState.CONNECTED)
+        await manager.disconnect_all()
+        await asyncio.sleep(0.05)
+
+        right = [state for side, state in seen if side == "right"]
+        assert right == [
+            ConnectionState.CONNECTING,
+            ConnectionState.CONNECTED,
+            ConnectionState.RECONNECTING,
+            ConnectionState.CONNECTED,
+            ConnectionState.DISCONNECTED,
+        ]
+        assert sorted(awaited) == sorted(seen)
+        assert not manager.right_glass._listener_tasks
+
+        return len(seen)
+
+    transitions = asyncio.run(scenario())
+    failures = [r for r in caplog.records if "listener broke" in r.getMessage()]
+    assert len(failures) == transitions  # Logged once per transition
+
+
+def record_write_modes(glass) -> list:
+    """Wrap the glass' client to note `response` for every write."""
+    modes = []
+    write = glass.client.write_gatt_char
+
+    async def recording(char, data, response=False):
+        modes.append(response)
+        return await write(char, data, response=response)
+
+    glass.client.write_gatt_char = recording
+    return modes
+
+
+def test_streaming_confirms_every_window_th_write():
+    async def scenario():
+        pair, manager = await connect()
+        try:
+            glass = manager.left_glass
+            modes = record_write_modes(glass)
+            glass.enable_streaming(4)
+            packet = bytes([Command.QUICK_NOTE, 0x00])
+            for _ in range(8):
+                assert await glass.send(packet)
+            assert modes == [False, False, False, True] * 2
+            assert list(pair.left.frames[-8:]) == [packet] * 8  # In order, none lost
+
+            glass.disable_streaming()
+            assert await glass.send(packet)
+            assert modes[-1] is True
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_streaming_resyncs_with_a_confirmed_write_after_an_error():
+    async def scenario():
+        pair, manager = await connect()
+        try:
+            glass = manager.left_glass
+            glass.enable_streaming(4)
+            packet = bytes([Command.QUICK_NOTE, 0x00])
+            assert await glass.send(packet)
+            write = glass.client.write_gatt_char
+
+            async def failing(char, data, response=False):
+                raise BleakError("write failed")
+
+            glass.client.write_gatt_char = failing
+            assert not await glass.send(packet)
+            glass.client.write_gatt_char = write
+            modes = record_write_modes(glass)
+            assert await glass.send(packet)
+            assert modes == [True]
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_send_text_with_streaming_reaches_both_arms():
+    async def scenario():
+        pair, manager = await connect()
+        try:
+            manager.enable_streaming(3)
+            text = "\n".join(f"line {i} of a longer streamed page" for i in range(12))
+            assert await send_text(manager, text, duration=0)
+            for arm in (pair.left, pair.right):
+                assert b"line 11" in b"".join(frame[9:] for frame in display_frames(arm))
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_mtu_is_discovered_per_arm_and_bounds_writes():
+    async def scenario():
+        pair = SimulatedGlassesPair(
+            left_config=FAST.model_copy(update={"mtu": 100}),
+            right_config=FAST.model_copy(update={"mtu": 185}),
+        )
+        manager = GlassesManager(client_factory=pair.client_factory, scanner=pair.scanner)
+        assert await manager.scan_and_connect(timeout=2)
+        try:
+            assert manager.left_glass.mtu == 100 and manager.right_glass.mtu == 185
+            assert manager.max_write_size == 97
+            # The simulator rejects writes over its MTU, so this fails if unbounded
+            assert await send_text(manager, "wide " * 60, duration=0)
+            for arm in (pair.left, pair.right):
+                assert display_frames(arm) and all(len(f) <= 97 for f in display_frames(arm))
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_mtu_is_acquired_from_the_backend_when_it_can():
+    async def scenario():
+        pair, manager = await connect()
+        glass = manager.left_glass
+        acquired = []
+
+        class Backend:
+            async def _acquire_mtu(self):
+                acquired.append(True)
+
+        try:
+            glass.client._backend = Backend()
+            assert await glass._discover_mtu() == FAST.mtu
+            assert acquired == [True]
+            glass.client.device.config = FAST.model_copy(update={"mtu": 0})
+            assert await glass._discover_mtu() == 247  # Unknown falls back to the default
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_reconnect_backoff_grows_with_jitter_and_a_cap():
+    pair = SimulatedGlassesPair()
+    glass = Glass(name=pair.left.name, address=pair.left.address, side="left", client_factory=pair.client_factory)
+    glass.reconnect_base_delay = 0.5
+    glass.reconnect_max_delay = 4.0
+    assert glass._backoff(1) == 0.0  # First retry at once
+    for attempt, full in ((2, 0.5), (3, 1.0), (4, 2.0), (5, 4.0), (9, 4.0)):
+        for _ in range(20):
+            assert full * 0.5 <= glass._backoff(attempt) <= full
+
+
+def test_reconnect_gives_up_after_max_attempts():
+    async def scenario():
+        pair, manager = await connect()
+        glass = manager.left_glass
+        glass.reconnect_base_delay = 0.001
+        glass.max_reconnect_attempts = 3
+        attempts = []
+
+        async def refuse(**kwargs):
+            attempts.append(True)
+            raise BleakError("out of range")
+
+        glass.client.connect = refuse
+        try:
+            pair.left.drop_link()
+            assert glass.state == ConnectionState.RECONNECTING
+            assert not await asyncio.wait_for(glass._reconnect_task, 2)
+            assert len(attempts) == 3
+            assert glass.state == ConnectionState.FAILED
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
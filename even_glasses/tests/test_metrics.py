@@ -0,0 +1,102 @@
+"""Metric types, their exports and what a Glass records."""
+import asyncio
+import json
+
+import pytest
+
+from even_glasses.bluetooth_manager import Glass
+from even_glasses.metrics import Histogram, MetricsRegistry, serve_metrics
+from even_glasses.models import Command
+from even_glasses.simulator import SimulatedGlassesPair
+
+from tests.test_glasses_manager import FAST
+
+
+def test_histogram_quantiles_report_bucket_bounds():
+    histogram = Histogram(buckets=(0.001, 0.01, 0.1))
+    assert histogram.quantile(0.5) is None
+    for value in (0.0005, 0.005, 0.005, 0.05, 5.0):
+        histogram.observe(value)
+    assert histogram.counts == [1, 2, 1, 1]
+    assert histogram.quantile(0.5) == 0.01
+    assert histogram.quantile(0.99) == float("inf")
+    assert histogram.count == 5 and histogram.sum == pytest.approx(5.0605)
+
+
+def test_registry_exports_prometheus_text_and_snapshots():
+    registry = MetricsRegistry()
+    sent = registry.counter("frames_total", "Frames", device='left "arm"')
+    assert registry.counter("frames_total", device='left "arm"') is sent  # One series per label set
+    sent.inc(3)
+    registry.gauge("pending", "Pending writes").set(2)
+    registry.histogram("rtt_seconds", "RTT", buckets=(0.1, 1.0)).observe(0.5)
+    with pytest.raises(ValueError):
+        registry.gauge("frames_total")
+
+    text = registry.to_prometheus()
+    assert "# TYPE frames_total counter" in text
+    assert 'frames_total{device="left \\"arm\\""} 3' in text
+    assert "pending 2" in text
+    assert 'rtt_seconds_bucket{le="0.1"} 0' in text
+    assert 'rtt_seconds_bucket{le="1.0"} 1' in text
+    assert 'rtt_seconds_bucket{le="+Inf"} 1' in text
+
+    snapshot = registry.snapshot()
+    assert snapshot["frames_total"][0]["value"] == 3 and snapshot["frames_total"][0]["rate"] > 0
+    assert snapshot["rtt_seconds"][0]["p50"] == 1.0
+    assert registry.snapshot()["frames_total"][0]["rate"] == 0  # Nothing new since
+
+
+def test_glass_records_its_io():
+    async def scenario():
+        pair = SimulatedGlassesPair(config=FAST)
+        registry = MetricsRegistry()
+        glass = Glass(
+            name=pair.left.name,
+            address=pair.left.address,
+            side="left",
+            client_factory=pair.client_factory,
+            metrics_registry=registry,
+        )
+        await glass.connect()
+        try:
+            packet = bytes([Command.QUICK_NOTE, 0x00])
+            for _ in range(3):
+                assert await glass.send_and_wait(packet, timeout=1)
+        finally:
+            await glass.disconnect()
+        return registry.snapshot()
+
+    snapshot = asyncio.run(scenario())
+    by_command = {row["labels"]["command"]: row["value"] for row in snapshot["even_glasses_sent_commands_total"]}
+    assert by_command["QUICK_NOTE"] == 3
+    assert snapshot["even_glasses_ack_rtt_seconds"][0]["count"] >= 3
+    assert snapshot["even_glasses_received_frames_total"][0]["value"] >= 3
+    assert snapshot["even_glasses_write_errors_total"][0]["value"] == 0
+    assert snapshot["even_glasses_pending_writes"][0]["value"] == 0
+
+
+def test_serve_metrics_over_http():
+    async def get(port: int, path: str) -> bytes:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        response = await reader.read()
+        writer.close()
+        return response
+
+    async def scenario():
+        registry = MetricsRegistry()
+        registry.counter("served_total", "Served").inc()
+        server = await serve_metrics(registry, port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            text = await get(port, "/metrics")
+            assert text.startswith(b"HTTP/1.1 200 OK") and b"served_total 1" in text
+            body = (await get(port, "/metrics.json")).split(b"\r\n\r\n", 1)[1]
+            assert json.loads(body)["served_total"][0]["value"] == 1
+            assert (await get(port, "/nope")).startswith(b"HTTP/1.1 404")
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(scenario())
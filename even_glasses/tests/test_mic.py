@@ -0,0 +1,69 @@
+"""Mic audio reassembly, alone and behind a simulated right arm."""
+import asyncio
+import io
+
+from even_glasses.mic import MicReceiver
+from even_glasses.models import Command
+
+from tests.test_glasses_manager import FAST, connect
+
+
+def mic_packet(index: int) -> bytes:
+    return bytes([Command.RECEIVE_MIC_DATA, index & 0xFF]) + index.to_bytes(4, "big")
+
+
+def drain(mic: MicReceiver) -> list:
+    frames = []
+    while True:
+        frame = mic.read_nowait()
+        if frame is None:
+            return frames
+        frames.append(int.from_bytes(frame, "big"))
+
+
+def test_mic_receiver_unwraps_seq_and_reorders():
+    mic = MicReceiver(capacity=64, frame_size=4, reorder_depth=4)
+    order = list(range(250, 600))
+    order[10], order[11] = order[11], order[10]  # Swapped pair
+    order[4], order[6] = order[6], order[4]  # Across the 255 -> 0 wrap
+    received = []
+    for index in order:
+        mic.feed(mic_packet(index))
+        received += drain(mic)
+    mic.close()
+    received += drain(mic)
+    assert received == list(range(250, 600))
+    assert mic.reordered == 3 and mic.lost == 0
+
+
+def test_mic_receiver_counts_lost_and_duplicate_frames():
+    mic = MicReceiver(capacity=64, frame_size=4, reorder_depth=4)
+    for index in [0, 1, 3, 4, 4, 5, 6, 7, 8]:
+        mic.feed(mic_packet(index))
+    mic.feed(mic_packet(2))  # Too late, already given up
+    mic.close()
+    assert drain(mic) == [0, 1, 3, 4, 5, 6, 7, 8]
+    assert mic.duplicates == 1 and mic.lost == 1 and mic.late == 1
+
+
+def test_start_mic_records_frames_in_order():
+    async def scenario():
+        config = FAST.model_copy(update={"mic_interval": 60, "mic_reorder": 0.3, "mic_frame_size": 8})
+        pair, manager = await connect(config)
+        try:
+            mic = await manager.start_mic()
+            assert mic is not None
+            sink = io.BytesIO()
+            recording = asyncio.create_task(mic.record(sink))
+            pair.right.push_mic(200)
+            await asyncio.sleep(0.05)
+            await manager.stop_mic()
+            written = await asyncio.wait_for(recording, 2)
+            assert mic.reordered > 0 and mic.lost == 0
+            assert mic.delivered >= pair.right.mic_sent - 1  # The last one may be held back
+            assert written == len(sink.getvalue()) == mic.delivered * 8
+            assert pair.right.frames[-1] == bytes([Command.OPEN_MIC, 0])
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
@@ -0,0 +1,75 @@
+"""NotificationQueue against a simulated pair."""
+import asyncio
+
+from even_glasses.models import Command, NCSNotification, NotificationPriority
+from even_glasses.notification_queue import NotificationQueue
+from tests.test_glasses_manager import connect
+
+
+def notification(msg_id: int, app: str = "org.example.chat", title: str = "Title") -> NCSNotification:
+    return NCSNotification(
+        msg_id=msg_id,
+        app_identifier=app,
+        title=title,
+        subtitle="",
+        message=f"message {msg_id}",
+        display_name="Chat",
+    )
+
+
+def test_duplicate_notification_replaces_queued_one():
+    async def scenario():
+        pair, manager = await connect()
+        try:
+            queue = manager.notifications
+            queue.put(notification(1, title="old"))
+            queue.put(notification(1, title="new"))
+            assert len(queue) == 1 and queue.replaced == 1
+            await asyncio.wait_for(queue.join(), 5)
+            assert queue.sent == 1
+            frames = b"".join(f for f in pair.left.frames if f[0] == Command.NOTIFICATION)
+            assert b"new" in frames and b"old" not in frames
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_bursts_collapse_into_a_summary():
+    async def scenario():
+        pair, manager = await connect()
+        try:
+            queue = manager.notifications
+            for msg_id in range(6):
+                queue.put(notification(msg_id))
+            queue.put(notification(99, app="org.example.mail"), NotificationPriority.HIGH)
+            assert len(queue) == 2
+            assert queue.summarized == 6
+            await asyncio.wait_for(queue.join(), 5)
+            frames = b"".join(f for f in pair.left.frames if f[0] == Command.NOTIFICATION)
+            assert b"6 new notifications" in frames
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_higher_priorities_are_sent_first_and_dropped_last():
+    async def scenario():
+        pair, manager = await connect()
+        try:
+            queue = NotificationQueue(manager, max_size=3)
+            queue.put(notification(1, app="a", title="low"), NotificationPriority.LOW)
+            queue.put(notification(2, app="b", title="normal"))
+            queue.put(notification(3, app="c", title="urgent"), NotificationPriority.URGENT)
+            queue.put(notification(4, app="d", title="high"), NotificationPriority.HIGH)
+            assert queue.dropped == 1  # The LOW one made room
+            await asyncio.wait_for(queue.join(), 5)
+            frames = b"".join(f[4:] for f in pair.left.frames if f[0] == Command.NOTIFICATION)
+            order = sorted((frames.index(t), t) for t in (b'"urgent"', b'"high"', b'"normal"'))
+            assert [title for _, title in order] == [b'"urgent"', b'"high"', b'"normal"']
+            assert b'"low"' not in frames
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
@@ -0,0 +1,49 @@
+"""Compiled-text cache behind send_text."""
+import asyncio
+
+from even_glasses.commands import send_text
+from even_glasses.page_cache import CompiledText, PageCache
+
+from tests.test_glasses_manager import connect, display_frames
+
+
+def compiled(nbytes: int) -> CompiledText:
+    return CompiledText([[bytes(nbytes)]], [])
+
+
+def test_page_cache_evicts_least_recently_used():
+    cache = PageCache(max_entries=2, max_bytes=1000)
+    cache.put("a", compiled(10))
+    cache.put("b", compiled(10))
+    assert cache.get("a") is not None  # "b" is now the oldest
+    cache.put("c", compiled(10))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.evictions == 1
+
+
+def test_page_cache_is_bounded_by_bytes():
+    cache = PageCache(max_entries=10, max_bytes=100)
+    cache.put("a", compiled(60))
+    cache.put("b", compiled(60))
+    assert cache.get("a") is None and cache.nbytes == 60
+    cache.put("huge", compiled(500))
+    assert cache.get("huge") is None and len(cache) == 1
+
+
+def test_repeated_text_is_served_from_the_cache():
+    async def scenario():
+        pair, manager = await connect()
+        try:
+            cache = PageCache()
+            text = "\n".join(f"cached line {i}" for i in range(8))
+            assert await send_text(manager, text, duration=0, cache=cache)
+            first = display_frames(pair.left)
+            assert cache.misses == 1 and len(cache) == 1
+            assert await send_text(manager, text, duration=0, cache=cache)
+            assert cache.hits == 1
+            assert display_frames(pair.left)[len(first):] == first  # Same bytes again
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
@@ -0,0 +1,153 @@
+"""scan_and_connect against the simulated scanner."""
+import asyncio
+import os
+import time
+
+from bleak.exc import BleakError
+
+from even_glasses.bluetooth_manager import GlassesManager
+from even_glasses.device_cache import DeviceCache
+from even_glasses.models import ConnectionState
+from even_glasses.simulator import SimulatedGlassesPair, SimulatedScanner
+
+from tests.test_glasses_manager import FAST
+
+
+class RecordingScanner(SimulatedScanner):
+    """Notes how many arms were connected each time scanning stopped."""
+
+    def __init__(self, devices, detection_callback=None, stops=None):
+        super().__init__(devices, detection_callback)
+        self.stops = [] if stops is None else stops
+
+    def __call__(self, detection_callback=None, **kwargs):
+        return RecordingScanner(self.devices, detection_callback, self.stops)
+
+    async def stop(self):
+        self.stops.append(sum(device.client is not None for device in self.devices))
+        await super().stop()
+
+
+def refusing(pair: SimulatedGlassesPair, side: str, times: int = 1000):
+    """client_factory whose first `times` clients for one arm fail to connect."""
+    device = getattr(pair, side)
+    refused = []
+
+    def client_factory(address, **kwargs):
+        client = pair.client_factory(address, **kwargs)
+        if client.device is device and len(refused) < times:
+            refused.append(client)
+
+            async def refuse(**kwargs):
+                raise BleakError(f"{device.name} refused the connection")
+
+            client.connect = refuse
+        return client
+
+    return client_factory
+
+
+def test_scan_stops_once_both_arms_are_found():
+    async def scenario():
+        pair = SimulatedGlassesPair(config=FAST.model_copy(update={"connect_delay": 0.2}))
+        scanner = RecordingScanner(pair.devices)
+        manager = GlassesManager(client_factory=pair.client_factory, scanner=scanner)
+        try:
+            assert await manager.scan_and_connect(timeout=2)
+            assert scanner.stops == [0]  # Stopped before either connect finished
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_each_arm_connects_as_soon_as_it_is_detected():
+    async def scenario():
+        pair = SimulatedGlassesPair(
+            left_config=FAST.model_copy(update={"advertise_delay": 0.01, "connect_delay": 0.02}),
+            right_config=FAST.model_copy(update={"advertise_delay": 0.2, "connect_delay": 0.02}),
+        )
+        manager = GlassesManager(client_factory=pair.client_factory, scanner=pair.scanner)
+        events = []
+        manager.add_state_listener(lambda glass, state: events.append((glass.side, state)))
+        try:
+            assert await manager.scan_and_connect(timeout=2)
+            # The left arm is up before the right one has even advertised
+            assert events.index(("left", ConnectionState.CONNECTED)) < events.index(
+                ("right", ConnectionState.CONNECTING)
+            )
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_known_addresses_skip_the_scan():
+    async def scenario():
+        pair = SimulatedGlassesPair(config=FAST)
+        scanner = RecordingScanner(pair.devices)
+        manager = GlassesManager(
+            left_address=pair.left.address,
+            right_address=pair.right.address,
+            client_factory=pair.client_factory,
+            scanner=scanner,
+        )
+        try:
+            assert await manager.scan_and_connect(timeout=2)
+            assert scanner.stops == []  # Never started
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_scan_times_out_when_an_arm_never_advertises():
+    async def scenario():
+        pair = SimulatedGlassesPair(
+            left_config=FAST,
+            right_config=FAST.model_copy(update={"advertise_delay": 30}),
+        )
+        manager = GlassesManager(client_factory=pair.client_factory, scanner=pair.scanner)
+        try:
+            started = time.monotonic()
+            await manager.scan_and_connect(timeout=0.2)
+            assert 0.2 <= time.monotonic() - started < 1
+            assert manager.left_glass.client.is_connected and manager.right_glass is None
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_failed_connect_ends_the_wait():
+    async def scenario():
+        pair = SimulatedGlassesPair(config=FAST)
+        manager = GlassesManager(client_factory=refusing(pair, "left"), scanner=pair.scanner)
+        try:
+            started = time.monotonic()
+            assert not await manager.scan_and_connect(timeout=5)
+            assert time.monotonic() - started < 1
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
+
+
+def test_stale_cached_arm_keeps_the_scan_running(tmp_path):
+    async def scenario():
+        pair = SimulatedGlassesPair(config=FAST)
+        cache = DeviceCache(os.path.join(tmp_path, "devices.json"))
+        for device in pair.devices:
+            cache.put(device.side, device.name, device.address)
+        manager = GlassesManager(
+            client_factory=refusing(pair, "left", times=1), scanner=pair.scanner, device_cache=cache
+        )
+        try:
+            # The cached left address fails once; the scan must find the arm again
+            assert await manager.scan_and_connect(timeout=2)
+            assert manager.left_glass.client.is_connected
+            assert cache.get().left.address == pair.left.address
+        finally:
+            await manager.disconnect_all()
+
+    asyncio.run(scenario())
@@ -0,0 +1,23 @@
+"""Width-based line wrapping."""
+from even_glasses.text_layout import DISPLAY_WIDTH, TextLayout, default_layout
+
+
+def test_whitespace_is_normalized_on_both_paths():
+    layout = TextLayout()
+    assert layout.wrap("a  b\tc") == ["a b c"]  # Fits on one line
+    long = "\t".join(["word"] * 60)
+    lines = layout.wrap(long)
+    assert len(lines) > 1
+    assert all("\t" not in line and "  " not in line for line in lines)
+    assert " ".join(lines).split() == ["word"] * 60
+
+
+def test_lines_fit_and_leave_a_margin():
+    assert default_layout.max_width < DISPLAY_WIDTH
+    text = "The quick brown fox jumps over the lazy dog. " * 20 + "W" * 80
+    for line in default_layout.wrap(text):
+        assert default_layout.text_width(line) <= default_layout.max_width
+
+
+def test_paragraphs_and_blank_lines():
+    assert default_layout.wrap("first\n\n  \nsecond ") == ["first", "second"]
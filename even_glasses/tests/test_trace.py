@@ -0,0 +1,87 @@
+"""Opt-in frame tracing and its sampling."""
+import asyncio
+import logging
+import subprocess
+import sys
+
+import pytest
+
+from even_glasses.models import Command
+from even_glasses.trace import RX, TX, Tracer, tracer
+
+from tests.test_glasses_manager import connect
+
+
+def frame(opcode: int) -> bytes:
+    return bytes([opcode, 0x01, 0x02])
+
+
+def test_tracer_is_off_until_a_sink_is_added():
+    trace = Tracer()
+    assert not trace.active
+    records = []
+    sink = trace.add_sink(records.append)
+    assert trace.active
+    trace.frame(TX, "left", frame(Command.QUICK_NOTE))
+    trace.remove_sink(sink)
+    assert not trace.active
+    record = records[0].as_dict()
+    assert record["direction"] == TX and record["command"] == "QUICK_NOTE"
+    assert record["data"] == frame(Command.QUICK_NOTE).hex()
+
+
+def test_sampling_is_per_opcode():
+    trace = Tracer()
+    records = []
+    trace.add_sink(records.append)
+    trace.set_sample_rate(Command.SEND_RESULT, 3)
+    for _ in range(7):
+        trace.frame(TX, "left", frame(Command.SEND_RESULT))
+        trace.frame(RX, "left", frame(Command.QUICK_NOTE))
+    for _ in range(100):
+        trace.frame(RX, "right", frame(Command.RECEIVE_MIC_DATA))  # 1 in 50 by default
+    counts = {}
+    for record in records:
+        counts[record.opcode] = counts.get(record.opcode, 0) + 1
+    assert counts == {Command.SEND_RESULT: 3, Command.QUICK_NOTE: 7, Command.RECEIVE_MIC_DATA: 2}
+    sampled = next(r for r in records if r.opcode == Command.SEND_RESULT)
+    assert sampled.sampled_out == 2 and "(1 in 3)" in str(sampled)
+    with pytest.raises(ValueError):
+        trace.set_sample_rate(Command.SEND_RESULT, 0)
+
+
+def test_failing_sink_does_not_stop_the_others(caplog):
+    trace = Tracer()
+    records = []
+
+    def broken(record):
+        raise RuntimeError("sink broke")
+
+    trace.add_sink(broken)
+    trace.add_sink(records.append)
+    trace.frame(TX, "left", frame(Command.QUICK_NOTE))
+    assert len(records) == 1
+    assert "sink broke" in caplog.text
+
+
+def test_log_frames_traces_a_session(caplog):
+    async def scenario():
+        pair, manager = await connect()
+        sink = tracer.log_frames()
+        try:
+            assert await manager.left_glass.send_and_wait(frame(Command.QUICK_NOTE), timeout=1)
+        finally:
+            tracer.remove_sink(sink)
+            await manager.disconnect_all()
+
+    with caplog.at_level(logging.DEBUG, logger="even_glasses.trace"):
+        asyncio.run(scenario())
+    lines = [r.getMessage() for r in caplog.records if r.name == "even_glasses.trace"]
+    assert any(line.startswith("tx ") and "QUICK_NOTE" in line for line in lines)
+    assert any(line.startswith("rx ") and "QUICK_NOTE" in line for line in lines)
+    assert not tracer.active
+
+
+def test_importing_the_library_leaves_logging_alone():
+    code = "import logging, even_glasses.bluetooth_manager; assert not logging.getLogger().handlers"
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,67 @@
+"""WorkerPool, its shards and the shared-memory ring it passes payloads through."""
+import asyncio
+import logging
+
+from even_glasses.simulator import simulated_backend
+from even_glasses.workers import SharedFrameRing, WorkerPool, shard
+
+
+def test_shared_frame_ring_wraps_and_reclaims_in_order():
+    ring = SharedFrameRing(size=32)
+    try:
+        a = ring.write(b"a" * 12)
+        b = ring.write(b"b" * 12)
+        assert ring.write(b"c" * 12) is None  # Full until the head is released
+        ring.release(b[0])
+        assert ring.write(b"c" * 12) is None  # Out of order release holds space
+        ring.release(a[0])
+        c = ring.write(b"c" * 12)
+        assert c == (0, 12)
+        assert bytes(ring.read(*c)) == b"c" * 12
+        d = ring.write(b"d" * 12)
+        assert d == (12, 12)
+        assert ring.write(b"e" * 12) is None
+    finally:
+        ring.close()
+
+    # A wrapped region that ends exactly at the head leaves the ring full
+    ring = SharedFrameRing(size=200)
+    try:
+        ring.write(b"a" * 100)
+        b = ring.write(b"b" * 100)
+        ring.release(0)
+        assert ring.write(b"c" * 100) == (0, 100)
+        assert ring.write(b"d" * 50) is None
+        assert bytes(ring.read(*b)) == b"b" * 100
+        ring.release(b[0])
+        assert ring.write(b"d" * 50) == (100, 50)
+    finally:
+        ring.close()
+
+
+def test_shard_is_round_robin_without_empty_shards():
+    assert shard(["1", "2", "3", "4", "5"], 2) == [["1", "3", "5"], ["2", "4"]]
+    assert shard(["1", "2"], 4) == [["1"], ["2"]]
+    assert shard([], 0) == []
+
+
+def test_worker_pool_routes_commands_to_simulated_pairs():
+    async def scenario():
+        pool = WorkerPool(
+            ["1", "2", "3"], workers=2, backend=simulated_backend, connect_timeout=5, log_level=logging.WARNING
+        )
+        try:
+            assert await pool.start() == 3
+            results = await pool.send_text("Hello from a worker", serials=["3"])
+            assert results == {"3": "Hello from a worker"}  # send_text returns the text
+            results = await pool.send_text("Hello everyone")
+            assert results == dict.fromkeys(["1", "2", "3"], "Hello everyone")
+            health = await pool.health()
+            assert len(health) == 2 and all(entry["alive"] and entry["responsive"] for entry in health.values())
+            assert sum(entry["inline_payloads"] for entry in health.values()) == 0
+            processes = [handle.process for handle in pool._handles]
+        finally:
+            await pool.stop()
+        assert not any(process.is_alive() for process in processes)
+
+    asyncio.run(scenario())
@@ -1,14 +1,15 @@
-import asyncio
 import flet as ft
 from even_glasses.bluetooth_manager import GlassesManager
+from even_glasses.device_cache import DeviceCache
 from even_glasses.commands import send_text
+from even_glasses.models import ConnectionState
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize GlassesManager
-manager = GlassesManager()
+manager = GlassesManager(device_cache=DeviceCache())
 
 async def main(page: ft.Page):
     page.title = "Glasses Control Prototype"
@@ -190,19 +191,20 @@ async def main(page: ft.Page):
         )
     )
 
-    # Monitor connection status
-    async def status_monitor():
-        while True:
-            await asyncio.sleep(1)
-            if manager.left_glass and manager.left_glass.client.is_connected:
-                status_text.value = "Status: Connected (Left Glass)"
-            elif manager.right_glass and manager.right_glass.client.is_connected:
-                status_text.value = "Status: Connected (Right Glass)"
-            else:
-                status_text.value = "Status: Disconnected"
-            page.update()
+    # Update the status when a glass changes connection state
+    def on_state_change(glass, state):
+        left, right = manager.left_glass, manager.right_glass
+        if left and left.state == ConnectionState.CONNECTED:
+            status_text.value = "Status: Connected (Left Glass)"
+        elif right and right.state == ConnectionState.CONNECTED:
+            status_text.value = "Status: Connected (Right Glass)"
+        elif state in (ConnectionState.RECONNECTING, ConnectionState.FAILED):
+            status_text.value = f"Status: {glass.side.capitalize()} Glass {state.value.title()}"
+        else:
+            status_text.value = "Status: Disconnected"
+        page.update()
 
-    asyncio.create_task(status_monitor())
+    manager.add_state_listener(on_state_change)
 
 if __name__ == "__main__":
     ft.app(target=main, port=8550, view=ft.AppView.WEB_BROWSER)
@@ -1,6 +1,7 @@
 import asyncio
 import logging
 from even_glasses.bluetooth_manager import GlassesManager
+from even_glasses.device_cache import DeviceCache
 from even_glasses.commands import send_text
 
 logging.basicConfig(level=logging.INFO)
@@ -8,7 +9,7 @@ logger = logging.getLogger(__name__)
 
 async def main():
     # Initialize the glasses manager
-    manager = GlassesManager()
+    manager = GlassesManager(device_cache=DeviceCache())
     
     try:
         # Scan for and connect to available glasses